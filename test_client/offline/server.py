@@ -0,0 +1,67 @@
+import argparse
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from test_client.util.logger import get_logger
+
+log = get_logger(__name__)
+
+SITE_DIR = Path(__file__).resolve().parent / 'site'
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        log.debug('offline %s - %s', self.address_string(), format % args)
+
+    def end_headers(self):
+        # the real app is a static bundle too; let the browser revalidate but not refetch within a test
+        self.send_header('Cache-Control', 'no-cache')
+        super().end_headers()
+
+
+class OfflineServer:
+    """Local stand-in for https://www.saucedemo.com serving the pages under ``site/``.
+
+    Mirrors what the sauce_demo page objects rely on: login errors, the
+    ``session-username`` cookie, inventory with the cart badge, the cart
+    (``cart-contents`` in localStorage) and the checkout steps with their
+    validation errors.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self._httpd = ThreadingHTTPServer((host, port), partial(_QuietHandler, directory=str(SITE_DIR)))
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'OfflineServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='offline-server', daemon=True)
+        self._thread.start()
+        log.info('Offline Sauce Demo server listening on %s', self.url)
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the offline Sauce Demo stand-in')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    server = OfflineServer(port=args.port).start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+// Offline stand-in for the Sauce Demo app: same DOM hooks, cookie and localStorage keys as the real site.
+(function () {
+  'use strict';
+
+  var PRODUCTS = [
+    { id: 4, name: 'Sauce Labs Backpack', price: 29.99 },
+    { id: 0, name: 'Sauce Labs Bike Light', price: 9.99 },
+    { id: 1, name: 'Sauce Labs Bolt T-Shirt', price: 15.99 },
+    { id: 5, name: 'Sauce Labs Fleece Jacket', price: 49.99 },
+    { id: 2, name: 'Sauce Labs Onesie', price: 7.99 },
+    { id: 3, name: 'Test.allTheThings() T-Shirt (Red)', price: 15.99 }
+  ];
+  var USERS = ['standard_user', 'locked_out_user', 'problem_user', 'performance_glitch_user', 'error_user', 'visual_user'];
+  var PASSWORD = 'secret_sauce';
+  var SESSION_COOKIE = 'session-username';
+  var CART_KEY = 'cart-contents';
+  var LOGIN_ERROR_KEY = 'offline-login-error';
+  var TAX_RATE = 0.08;
+
+  function el(tag, attrs, text) {
+    var node = document.createElement(tag);
+    Object.keys(attrs || {}).forEach(function (key) { node.setAttribute(key, attrs[key]); });
+    if (text !== undefined) node.textContent = text;
+    return node;
+  }
+
+  function slug(name) { return name.toLowerCase().replace(/\s+/g, '-'); }
+  function money(value) { return '$' + value.toFixed(2); }
+  function product(id) { return PRODUCTS.filter(function (p) { return p.id === id; })[0]; }
+  function go(path) { window.location.href = path; }
+
+  function currentUser() {
+    var match = document.cookie.match(new RegExp('(?:^|; )' + SESSION_COOKIE + '=([^;]*)'));
+    return match ? decodeURIComponent(match[1]) : null;
+  }
+
+  function cart() {
+    try {
+      var ids = JSON.parse(localStorage.getItem(CART_KEY));
+      return Array.isArray(ids) ? ids.filter(product) : [];
+    } catch (e) {
+      return [];
+    }
+  }
+
+  function saveCart(ids) {
+    if (ids.length) localStorage.setItem(CART_KEY, JSON.stringify(ids));
+    else localStorage.removeItem(CART_KEY);
+    renderBadge();
+  }
+
+  function showError(container, message) {
+    container.innerHTML = '';
+    container.appendChild(el('h3', { 'data-test': 'error' }, message));
+  }
+
+  function renderBadge() {
+    var link = document.querySelector('.shopping_cart_link');
+    if (!link) return;
+    link.innerHTML = '';
+    var count = cart().length;
+    if (count) link.appendChild(el('span', { 'class': 'shopping_cart_badge', 'data-test': 'shopping-cart-badge' }, String(count)));
+  }
+
+  function setupMenu() {
+    var menu = document.querySelector('.bm-menu-wrap');
+    document.getElementById('react-burger-menu-btn').addEventListener('click', function () { menu.hidden = false; });
+    document.getElementById('react-burger-cross-btn').addEventListener('click', function () { menu.hidden = true; });
+    document.getElementById('logout_sidebar_link').addEventListener('click', function (e) {
+      e.preventDefault();
+      document.cookie = SESSION_COOKIE + '=; path=/; max-age=0';
+      go('/');
+    });
+    document.getElementById('reset_sidebar_link').addEventListener('click', function (e) {
+      e.preventDefault();
+      saveCart([]);
+      if (document.body.getAttribute('data-page') === 'inventory') renderInventory();
+    });
+  }
+
+  function cartButton(item, inCart) {
+    var action = inCart ? 'remove' : 'add-to-cart';
+    var button = el('button', {
+      'class': 'btn btn_small btn_inventory ' + (inCart ? 'btn_secondary' : 'btn_primary'),
+      id: action + '-' + slug(item.name),
+      name: action + '-' + slug(item.name),
+      'data-test': action + '-' + slug(item.name),
+      type: 'button'
+    }, inCart ? 'Remove' : 'Add to cart');
+    button.addEventListener('click', function () {
+      var ids = cart().filter(function (id) { return id !== item.id; });
+      if (!inCart) ids.push(item.id);
+      saveCart(ids);
+      button.replaceWith(cartButton(item, !inCart));
+    });
+    return button;
+  }
+
+  function itemCard(item, cls, withButton, inCart) {
+    var card = el('div', { 'class': cls, 'data-test': 'inventory-item' });
+    if (cls === 'cart_item') card.appendChild(el('div', { 'class': 'cart_quantity', 'data-test': 'item-quantity' }, '1'));
+    var link = el('a', { href: '#', id: 'item_' + item.id + '_title_link', 'data-test': 'item-' + item.id + '-title-link' });
+    link.appendChild(el('div', { 'class': 'inventory_item_name', 'data-test': 'inventory-item-name' }, item.name));
+    card.appendChild(link);
+    card.appendChild(el('div', { 'class': 'inventory_item_price', 'data-test': 'inventory-item-price' }, money(item.price)));
+    if (withButton) card.appendChild(cartButton(item, inCart));
+    return card;
+  }
+
+  function renderLogin() {
+    var form = document.getElementById('login_form');
+    var errors = form.querySelector('.error-message-container');
+    var pending = sessionStorage.getItem(LOGIN_ERROR_KEY);
+    if (pending) {
+      sessionStorage.removeItem(LOGIN_ERROR_KEY);
+      showError(errors, pending);
+    }
+    form.addEventListener('submit', function (e) {
+      e.preventDefault();
+      var user = document.getElementById('user-name').value;
+      var password = document.getElementById('password').value;
+      if (!user) return showError(errors, 'Epic sadface: Username is required');
+      if (!password) return showError(errors, 'Epic sadface: Password is required');
+      if (USERS.indexOf(user) === -1 || password !== PASSWORD) {
+        return showError(errors, 'Epic sadface: Username and password do not match any user in this service');
+      }
+      if (user === 'locked_out_user') return showError(errors, 'Epic sadface: Sorry, this user has been locked out.');
+      document.cookie = SESSION_COOKIE + '=' + encodeURIComponent(user) + '; path=/; max-age=600';
+      go('/inventory.html');
+    });
+  }
+
+  function renderInventory() {
+    var list = document.querySelector('.inventory_list');
+    var ids = cart();
+    list.innerHTML = '';
+    PRODUCTS.forEach(function (item) { list.appendChild(itemCard(item, 'inventory_item', true, ids.indexOf(item.id) !== -1)); });
+  }
+
+  function renderCart() {
+    var list = document.querySelector('.cart_list');
+    cart().forEach(function (id) {
+      var card = itemCard(product(id), 'cart_item', true, true);
+      // removing from the cart page drops the whole row instead of toggling the button
+      card.addEventListener('click', function (e) {
+        if (e.target.id.indexOf('remove-') !== 0) return;
+        e.stopPropagation();
+        saveCart(cart().filter(function (other) { return other !== id; }));
+        card.remove();
+      }, true);
+      list.appendChild(card);
+    });
+    document.querySelector('[data-test="continue-shopping"]').addEventListener('click', function () { go('/inventory.html'); });
+    document.querySelector('[data-test="checkout"]').addEventListener('click', function () { go('/checkout-step-one.html'); });
+  }
+
+  function renderCheckoutOne() {
+    var form = document.getElementById('checkout_info_form');
+    var errors = form.querySelector('.error-message-container');
+    document.querySelector('[data-test="cancel"]').addEventListener('click', function () { go('/cart.html'); });
+    form.addEventListener('submit', function (e) {
+      e.preventDefault();
+      if (!document.getElementById('first-name').value) return showError(errors, 'Error: First Name is required');
+      if (!document.getElementById('last-name').value) return showError(errors, 'Error: Last Name is required');
+      if (!document.getElementById('postal-code').value) return showError(errors, 'Error: Postal Code is required');
+      go('/checkout-step-two.html');
+    });
+  }
+
+  function renderCheckoutTwo() {
+    var list = document.querySelector('.cart_list');
+    var subtotal = 0;
+    cart().forEach(function (id) {
+      var item = product(id);
+      subtotal += item.price;
+      list.appendChild(itemCard(item, 'cart_item', false, true));
+    });
+    var tax = Math.round(subtotal * TAX_RATE * 100) / 100;
+    document.querySelector('.summary_subtotal_label').textContent = 'Item total: ' + money(subtotal);
+    document.querySelector('.summary_tax_label').textContent = 'Tax: ' + money(tax);
+    document.querySelector('.summary_total_label').textContent = 'Total: ' + money(subtotal + tax);
+    document.querySelector('[data-test="cancel"]').addEventListener('click', function () { go('/inventory.html'); });
+    document.querySelector('[data-test="finish"]').addEventListener('click', function () {
+      saveCart([]);
+      go('/checkout-complete.html');
+    });
+  }
+
+  function renderComplete() {
+    document.querySelector('[data-test="back-to-products"]').addEventListener('click', function () { go('/inventory.html'); });
+  }
+
+  var PAGES = {
+    login: renderLogin,
+    inventory: renderInventory,
+    cart: renderCart,
+    'checkout-one': renderCheckoutOne,
+    'checkout-two': renderCheckoutTwo,
+    complete: renderComplete
+  };
+
+  var page = document.body.getAttribute('data-page');
+  if (page !== 'login') {
+    if (!currentUser()) {
+      sessionStorage.setItem(LOGIN_ERROR_KEY, "Epic sadface: You can only access '" + window.location.pathname + "' when you are logged in.");
+      go('/');
+      return;
+    }
+    setupMenu();
+    renderBadge();
+  }
+  PAGES[page]();
+})();
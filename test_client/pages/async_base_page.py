@@ -0,0 +1,138 @@
+from __future__ import annotations
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple
+
+from test_client.pages.base_page import _FIRST_OUTCOME_JS, _ITEM_INDEX_JS, _READ_MANY_JS, _PageObjectBase, _build_item_index, navigation_stats
+from test_client.util.util import PAGE_META_ATTRS
+
+if TYPE_CHECKING:
+    from playwright.async_api import Locator
+
+
+def async_expect(actual, message: Optional[str] = None):
+    """Playwright's asyncio ``expect`` (assertions must be awaited), imported on first use."""
+    from playwright.async_api import expect as playwright_expect
+
+    return playwright_expect(actual, message)
+
+
+class AsyncBasePage(_PageObjectBase):
+    """asyncio counterpart of BasePage, driving a ``playwright.async_api`` Page.
+
+    Subclasses point ``SYNC_PAGE`` at the sync page object they mirror and
+    inherit its locator section, URL path and key constants, so both variants
+    stay bound to the same ``config/locators.yml`` entries.
+    """
+
+    SYNC_PAGE: Optional[type] = None
+
+    def __init_subclass__(cls, **kwargs):
+        sync_page = vars(cls).get('SYNC_PAGE')
+        if sync_page is not None:
+            for klass in reversed(sync_page.__mro__):
+                for name, value in vars(klass).items():
+                    if name.isupper() and isinstance(value, str) and (name in PAGE_META_ATTRS or name not in vars(cls)):
+                        setattr(cls, name, value)
+        super().__init_subclass__(**kwargs)
+
+    async def is_at(self, path: Optional[str] = None) -> bool:
+        """True when the page already shows the document at `path` (default URL_PATH) and its DOM is ready."""
+        if not self._is_current_url(path):
+            return False
+        state = self._state()
+        if not state.dom_ready:
+            state.dom_ready = await self.page.evaluate('document.readyState') != 'loading'
+        return state.dom_ready
+
+    async def navigate(self, path: Optional[str] = None, force: bool = False):
+        """Go to `path` (default URL_PATH); a goto that would reload the current document is skipped unless forced."""
+        if not force and await self.is_at(path):
+            navigation_stats['avoided'] += 1
+            return
+        navigation_stats['performed'] += 1
+        self._state()
+        started = time.perf_counter()
+        await self.page.goto(self.url_for(path))
+        navigation_stats['seconds'] += time.perf_counter() - started
+
+    def get_element(self, selector: str) -> Locator:
+        cache = self._state().locators
+        locator = cache.get(selector)
+        if locator is None:
+            locator = cache[selector] = self.page.locator(selector)
+        return locator
+
+    async def read_many(self, selectors: Dict[str, str], prop: str = 'text', wait_for_all: bool = False, timeout: float = 5000) -> Dict[str, Any]:
+        """Read `prop` ('text' or 'visible') for several plain CSS selectors in one browser round trip (see BasePage.read_many)."""
+        names = list(selectors)
+        arg = [[selectors[n] for n in names], prop, wait_for_all]
+        if wait_for_all:
+            handle = await self.page.wait_for_function(_READ_MANY_JS, arg=arg, timeout=timeout)
+            values = await handle.json_value()
+        else:
+            values = await self.page.evaluate(_READ_MANY_JS, arg)
+        return dict(zip(names, values))
+
+    async def item_index(self, item_selector: str, name_selector: str, require: Optional[str] = None, timeout: float = 5000) -> Dict[str, str]:
+        """Item name -> selector of that item's element, read in one DOM evaluation (see BasePage.item_index)."""
+        key = (item_selector, name_selector)
+        indexes = self._state().item_indexes
+        index = indexes.get(key)
+        if index is not None and (require is None or require in index):
+            return index
+        arg = [item_selector, name_selector, require]
+        if require is None:
+            entries = await self.page.evaluate(_ITEM_INDEX_JS, arg)
+        else:
+            handle = await self.page.wait_for_function(_ITEM_INDEX_JS, arg=arg, timeout=timeout)
+            entries = await handle.json_value()
+        index = _build_item_index(item_selector, entries)
+        if index:
+            indexes[key] = index
+        return index
+
+    async def item_selector(self, item_selector: str, name_selector: str, name: str) -> str:
+        return (await self.item_index(item_selector, name_selector, require=name))[name]
+
+    async def click_element(self, selector: str):
+        await self.get_element(selector).click()
+
+    async def fill_input(self, selector: str, text: str):
+        await self.get_element(selector).fill(text)
+
+    async def expect_element_visible(self, selector: str):
+        await async_expect(self.get_element(selector)).to_be_visible()
+
+    async def expect_element_text(self, selector: str, text: str):
+        await async_expect(self.get_element(selector)).to_have_text(text)
+
+    async def verify_title(self, expected_title: str):
+        await async_expect(self.page).to_have_title(f'*{expected_title}.*', use_regex=True)
+
+    async def expect_matches_baseline(
+        self,
+        name: str,
+        region: Optional[str] = None,
+        threshold: float = 0.001,
+        mask: Sequence[str] = (),
+        ignore: Sequence[Tuple[int, int, int, int]] = (),
+    ):
+        """Compare a screenshot of the viewport (or `region`) with the stored baseline `name` (see BasePage.expect_matches_baseline)."""
+        from test_client.util import visual
+
+        target = self.get_element(region) if region else self.page
+        png = await target.screenshot(animations='disabled', caret='hide', mask=[self.get_element(selector) for selector in mask])
+        visual.assert_matches(png, name, visual.variant_of(self.page), threshold=threshold, ignore=ignore)
+
+    async def wait_for_outcome(
+        self, selectors: Optional[Dict[str, str]] = None, urls: Optional[Dict[str, str]] = None, timeout: float = 5000
+    ) -> Optional[str]:
+        """Name of the first outcome reached among `selectors` / `urls`, None on timeout (see BasePage.wait_for_outcome)."""
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        arg = [list((selectors or {}).items()), list((urls or {}).items())]
+        try:
+            handle = await self.page.wait_for_function(_FIRST_OUTCOME_JS, arg=arg, timeout=timeout)
+        except PlaywrightTimeoutError:
+            return None
+        return await handle.json_value()
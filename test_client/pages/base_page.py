@@ -1,16 +1,221 @@
-from playwright.sync_api import Page, expect
+from __future__ import annotations
+import time
+import weakref
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
+from test_client.util import impact
+from test_client.util.util import PAGE_META_ATTRS, bind_locators
+
+if TYPE_CHECKING:
+    # playwright.sync_api is imported on first use, keeping it off the collection path
+    from playwright.sync_api import Locator, Page
+
+# goto calls made vs. skipped because the page was already on the target document, and seconds spent in goto
+# (all page objects, this process)
+navigation_stats: Counter = Counter()
+
+
+def expect(actual, message: Optional[str] = None):
+    """Playwright's ``expect``, imported on the first assertion rather than at module import."""
+    from playwright.sync_api import expect as playwright_expect
+
+    return playwright_expect(actual, message)
+
+
+class _PageState:
+    """Bookkeeping per Playwright Page, shared by every page object on that page."""
+
+    def __init__(self, page: Page):
+        # Locator objects, dropped on main-frame navigation
+        self.locators: Dict[str, Locator] = {}
+        # (item selector, name selector) -> {item name: item selector}, see item_index(); dropped on main-frame navigation
+        self.item_indexes: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # pages reach page objects either blank or already loaded by a previous goto
+        self.dom_ready = True
+        page.on('framenavigated', self._on_navigated)
+        page.on('domcontentloaded', self._on_dom_ready)
+
+    def _on_navigated(self, frame):
+        if frame.parent_frame is None:
+            self.locators.clear()
+            self.item_indexes.clear()
+            self.dom_ready = False
+
+    def _on_dom_ready(self, _page):
+        self.dom_ready = True
+
+
+_PAGE_STATES: weakref.WeakKeyDictionary[Page, _PageState] = weakref.WeakKeyDictionary()
+
+# Reads text or visibility of several CSS selectors in a single browser round trip (null for missing elements)
+_READ_MANY_JS = """
+([selectors, prop, waitForAll]) => {
+  const values = selectors.map((sel) => {
+    const el = document.querySelector(sel);
+    if (!el) return null;
+    if (prop === 'visible') {
+      const rect = el.getBoundingClientRect();
+      return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    }
+    return el.innerText;
+  });
+  if (waitForAll && values.some((v) => v === null)) return null;
+  return values;
+}
+"""
+
+# First outcome whose CSS selector is visible or whose URL regex matches location.href, else null (keep waiting)
+_FIRST_OUTCOME_JS = """
+([selectors, urls]) => {
+  for (const [name, pattern] of urls) {
+    if (new RegExp(pattern).test(window.location.href)) return name;
+  }
+  for (const [name, sel] of selectors) {
+    const el = document.querySelector(sel);
+    if (!el) continue;
+    const rect = el.getBoundingClientRect();
+    if (rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden') return name;
+  }
+  return null;
+}
+"""
+
+# [name, escaped id of the item's first element with an id (or null), position] of every item, in one pass;
+# null while `required` is given but no item has that name yet (keep waiting)
+_ITEM_INDEX_JS = """
+([itemSel, nameSel, required]) => {
+  const entries = Array.from(document.querySelectorAll(itemSel), (item, i) => {
+    const nameEl = item.querySelector(nameSel);
+    const idEl = item.querySelector('[id]');
+    return [nameEl ? nameEl.textContent.trim() : null, idEl ? CSS.escape(idEl.id) : null, i];
+  }).filter(([name]) => name !== null);
+  if (required !== null && !entries.some(([name]) => name === required)) return null;
+  return entries;
+}
+"""
+
+
+def _build_item_index(item_selector: str, entries: List[list]) -> Dict[str, str]:
+    # an element id inside the item survives re-renders and add/remove button swaps; the position is the fallback
+    return {name: f'{item_selector}:has(#{elem_id})' if elem_id else f'{item_selector} >> nth={position}' for name, elem_id, position in entries}
+
+
+class _PageObjectBase:
+    """Locator binding, URL and per-page state shared by the sync BasePage and the asyncio AsyncBasePage."""
+
+    # section of config/locators.yml; every other upper-case str constant of a subclass is a locator key
+    LOCATOR_PAGE: str = ''
+    # path under base_url the page lives at; navigate() goes there by default
+    URL_PATH: str = ''
+    _locator_keys: FrozenSet[str] = frozenset()
+    _selectors: Dict[str, str] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._locator_keys = frozenset(
+            value
+            for klass in cls.__mro__
+            for name, value in vars(klass).items()
+            if name.isupper() and name not in PAGE_META_ATTRS and isinstance(value, str)
+        )
 
-class BasePage:
     def __init__(self, page: Page, base_url: str):
         self.page = page
         self.base_url = base_url
+        cls = type(self)
+        if cls.LOCATOR_PAGE and '_selectors' not in vars(cls):
+            # resolved once per class, on first instantiation (locators.yml is not read at import); _loc is then a plain dict lookup
+            cls._selectors = bind_locators(cls.LOCATOR_PAGE, cls._locator_keys)
+        impact.record_class(cls)
+
+    def _loc(self, key: str) -> str:
+        impact.record_locator(self.LOCATOR_PAGE, key)
+        return self._selectors[key]
+
+    def _state(self) -> _PageState:
+        state = _PAGE_STATES.get(self.page)
+        if state is None:
+            state = _PAGE_STATES[self.page] = _PageState(self.page)
+        return state
+
+    def url_for(self, path: Optional[str] = None) -> str:
+        return f'{self.base_url}/{self.URL_PATH if path is None else path}'
+
+    def _is_current_url(self, path: Optional[str]) -> bool:
+        return self.page.url.split('#', 1)[0].rstrip('/') == self.url_for(path).rstrip('/')
+
+    def forget_items(self, item_selector: str, name_selector: str):
+        """Drop the cached item index after an action that adds, removes or reorders items."""
+        self._state().item_indexes.pop((item_selector, name_selector), None)
+
 
-    def navigate(self, path: str = ''):
-        self.page.goto(f'{self.base_url}/{path}')
+class BasePage(_PageObjectBase):
+    def is_at(self, path: Optional[str] = None) -> bool:
+        """True when the page already shows the document at `path` (default URL_PATH) and its DOM is ready."""
+        if not self._is_current_url(path):
+            return False
+        state = self._state()
+        if not state.dom_ready:
+            # same-document (history API) navigations never fire domcontentloaded; ask the page once
+            state.dom_ready = self.page.evaluate('document.readyState') != 'loading'
+        return state.dom_ready
 
-    def get_element(self, selector: str):
-        return self.page.locator(selector)
+    def navigate(self, path: Optional[str] = None, force: bool = False):
+        """Go to `path` (default URL_PATH); a goto that would reload the current document is skipped unless forced."""
+        if not force and self.is_at(path):
+            navigation_stats['avoided'] += 1
+            return
+        navigation_stats['performed'] += 1
+        self._state()
+        started = time.perf_counter()
+        self.page.goto(self.url_for(path))
+        navigation_stats['seconds'] += time.perf_counter() - started
+
+    def get_element(self, selector: str) -> Locator:
+        cache = self._state().locators
+        locator = cache.get(selector)
+        if locator is None:
+            locator = cache[selector] = self.page.locator(selector)
+        return locator
+
+    def read_many(self, selectors: Dict[str, str], prop: str = 'text', wait_for_all: bool = False, timeout: float = 5000) -> Dict[str, Any]:
+        """
+        Read `prop` ('text' or 'visible') for several plain CSS selectors in one browser round trip.
+        Missing elements read as None; with wait_for_all, wait until every selector matches instead.
+        """
+        names = list(selectors)
+        arg = [[selectors[n] for n in names], prop, wait_for_all]
+        if wait_for_all:
+            values = self.page.wait_for_function(_READ_MANY_JS, arg=arg, timeout=timeout).json_value()
+        else:
+            values = self.page.evaluate(_READ_MANY_JS, arg)
+        return dict(zip(names, values))
+
+    def item_index(self, item_selector: str, name_selector: str, require: Optional[str] = None, timeout: float = 5000) -> Dict[str, str]:
+        """
+        Item name -> selector of that item's element, for every `item_selector` element (name read from `name_selector`),
+        read in one DOM evaluation and cached until the next navigation or forget_items().
+        With `require`, the index is re-read (waiting up to `timeout`) until it has an item of that name.
+        """
+        key = (item_selector, name_selector)
+        indexes = self._state().item_indexes
+        index = indexes.get(key)
+        if index is not None and (require is None or require in index):
+            return index
+        arg = [item_selector, name_selector, require]
+        if require is None:
+            entries = self.page.evaluate(_ITEM_INDEX_JS, arg)
+        else:
+            entries = self.page.wait_for_function(_ITEM_INDEX_JS, arg=arg, timeout=timeout).json_value()
+        index = _build_item_index(item_selector, entries)
+        if index:
+            indexes[key] = index
+        return index
+
+    def item_selector(self, item_selector: str, name_selector: str, name: str) -> str:
+        """Selector of the item named `name` (exact text, quotes allowed), from item_index()."""
+        return self.item_index(item_selector, name_selector, require=name)[name]
 
     def click_element(self, selector: str):
         self.get_element(selector).click()
@@ -26,3 +231,38 @@ class BasePage:
 
     def verify_title(self, expected_title: str):
         expect(self.page).to_have_title(f'*{expected_title}.*', use_regex=True)
+
+    def expect_matches_baseline(
+        self,
+        name: str,
+        region: Optional[str] = None,
+        threshold: float = 0.001,
+        mask: Sequence[str] = (),
+        ignore: Sequence[Tuple[int, int, int, int]] = (),
+    ):
+        """
+        Screenshot the viewport (or the `region` element) and compare it with the stored baseline `name`, kept per browser
+        and viewport. Elements matching `mask` are painted over, `ignore` rectangles (x, y, w, h) are left out of the diff.
+        Fails when more than `threshold` of the pixels changed; ``--update-baselines`` rewrites the baseline instead.
+        """
+        from test_client.util import visual
+
+        target = self.get_element(region) if region else self.page
+        png = target.screenshot(animations='disabled', caret='hide', mask=[self.get_element(selector) for selector in mask])
+        visual.assert_matches(png, name, visual.variant_of(self.page), threshold=threshold, ignore=ignore)
+
+    def wait_for_outcome(
+        self, selectors: Optional[Dict[str, str]] = None, urls: Optional[Dict[str, str]] = None, timeout: float = 5000
+    ) -> Optional[str]:
+        """
+        Race several outcomes and return the name of the first one reached: a visible element for one of
+        `selectors` (plain CSS) or a URL matching one of `urls` (JS regex). Returns None on timeout.
+        The check runs in the browser on every animation frame and survives navigations.
+        """
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+        arg = [list((selectors or {}).items()), list((urls or {}).items())]
+        try:
+            return self.page.wait_for_function(_FIRST_OUTCOME_JS, arg=arg, timeout=timeout).json_value()
+        except PlaywrightTimeoutError:
+            return None
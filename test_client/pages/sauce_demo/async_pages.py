@@ -0,0 +1,132 @@
+# asyncio variants of the sauce_demo page objects (locator keys and URLs come from the sync classes via SYNC_PAGE)
+from typing import Dict, List, Optional, Sequence
+from test_client.pages.async_base_page import AsyncBasePage, async_expect
+from test_client.pages.sauce_demo.login_page import LoginPage
+from test_client.pages.sauce_demo.checkout.cart_state import cart_seed_script
+from test_client.pages.sauce_demo.checkout.inventory_page import InventoryPage
+from test_client.pages.sauce_demo.checkout.cart_page import CartPage
+from test_client.pages.sauce_demo.checkout.checkout_info_page import CheckoutInfoPage
+from test_client.pages.sauce_demo.checkout.checkout_overview_page import CheckoutOverviewPage
+from test_client.pages.sauce_demo.checkout.checkout_complete_page import CheckoutCompletePage
+
+
+class AsyncLoginPage(AsyncBasePage):
+    SYNC_PAGE = LoginPage
+
+    async def login(self, username: str, password: str):
+        await self.fill_input(self._loc(self.USERNAME), username)
+        await self.fill_input(self._loc(self.PASSWORD), password)
+        await self.click_element(self._loc(self.LOGIN_BUTTON))
+
+    async def login_and_verify(self, username: str, password: str, timeout: int = 5000):
+        await self.login(username, password)
+        await async_expect(self.get_element(self._loc(self.INVENTORY_CONTAINER))).to_be_visible(timeout=timeout)
+
+    async def get_error_text(self) -> str:
+        return await self.get_element(self._loc(self.ERROR_MESSAGE)).inner_text()
+
+    async def wait_for_login_outcome(self, timeout: int = 5000, outcomes: Sequence[str] = ('inventory', 'error')) -> Optional[str]:
+        keys = {'inventory': self.INVENTORY_CONTAINER, 'error': self.ERROR_MESSAGE, 'login': self.LOGIN_BUTTON}
+        return await self.wait_for_outcome({name: self._loc(keys[name]) for name in outcomes}, timeout=timeout)
+
+    async def is_logged_in(self, timeout: int = 2000) -> bool:
+        return await self.wait_for_login_outcome(timeout) == 'inventory'
+
+    async def logout(self):
+        await self.click_element(self._loc(self.MENU_BUTTON))
+        await self.click_element(self._loc(self.LOGOUT_LINK))
+
+
+class AsyncInventoryPage(AsyncBasePage):
+    SYNC_PAGE = InventoryPage
+
+    async def _item(self, name: str) -> str:
+        return await self.item_selector(self._loc(self.ITEM), self._loc(self.ITEM_NAME), name)
+
+    async def add_item_by_name(self, name: str):
+        await self.click_element(f'{await self._item(name)} >> {self._loc(self.ADD_TO_CART_BTN)}')
+
+    async def remove_item_by_name(self, name: str):
+        await self.click_element(f'{await self._item(name)} >> {self._loc(self.REMOVE_BTN)}')
+
+    async def seed_cart(self, names: List[str]):
+        await self.page.add_init_script(script=cart_seed_script(self.base_url, names))
+
+    async def open_cart(self):
+        await self.click_element(self._loc(self.CART_LINK))
+
+    async def get_cart_count(self) -> int:
+        text = (await self.read_many({'badge': self._loc(self.CART_BADGE)}))['badge']
+        return int(text) if text else 0
+
+    async def get_item_names(self) -> List[str]:
+        return await self.get_element(self._loc(self.ITEM_NAME)).all_text_contents()
+
+
+class AsyncCartPage(AsyncBasePage):
+    SYNC_PAGE = CartPage
+
+    async def get_item_names(self) -> List[str]:
+        return await self.get_element(self._loc(self.ITEM_NAME)).all_text_contents()
+
+    async def remove_item_by_name(self, name: str):
+        item = await self.item_selector(self._loc(self.CART_ITEM), self._loc(self.ITEM_NAME), name)
+        await self.click_element(f'{item} >> {self._loc(self.REMOVE_BTN)}')
+        self.forget_items(self._loc(self.CART_ITEM), self._loc(self.ITEM_NAME))
+
+    async def proceed_to_checkout(self):
+        await self.click_element(self._loc(self.CHECKOUT_BUTTON))
+
+    async def continue_shopping(self):
+        await self.click_element(self._loc(self.CONTINUE_SHOPPING))
+
+    async def is_empty(self) -> bool:
+        return await self.get_element(self._loc(self.CART_ITEM)).count() == 0
+
+
+class AsyncCheckoutInfoPage(AsyncBasePage):
+    SYNC_PAGE = CheckoutInfoPage
+
+    async def fill_checkout_info(self, first_name: str, last_name: str, postal_code: str):
+        await self.fill_input(self._loc(self.FIRST_NAME), first_name)
+        await self.fill_input(self._loc(self.LAST_NAME), last_name)
+        await self.fill_input(self._loc(self.POSTAL_CODE), postal_code)
+
+    async def continue_to_overview(self, first_name: str = None, last_name: str = None, postal_code: str = None):
+        if first_name is not None or last_name is not None or postal_code is not None:
+            await self.fill_checkout_info(first_name or '', last_name or '', postal_code or '')
+        await self.click_element(self._loc(self.CONTINUE_BUTTON))
+
+    async def cancel(self):
+        await self.click_element(self._loc(self.CANCEL_BUTTON))
+
+
+class AsyncCheckoutOverviewPage(AsyncBasePage):
+    SYNC_PAGE = CheckoutOverviewPage
+
+    async def get_item_names(self) -> List[str]:
+        return await self.get_element(self._loc(self.ITEM_NAME)).all_text_contents()
+
+    async def get_summary(self) -> Dict[str, str]:
+        keys = {'subtotal': self.SUMMARY_SUBTOTAL, 'tax': self.SUMMARY_TAX, 'total': self.SUMMARY_TOTAL}
+        return await self.read_many({name: self._loc(key) for name, key in keys.items()}, wait_for_all=True)
+
+    async def finish_checkout(self):
+        await self.click_element(self._loc(self.FINISH_BUTTON))
+
+    async def cancel(self):
+        await self.click_element(self._loc(self.CANCEL_BUTTON))
+
+
+class AsyncCheckoutCompletePage(AsyncBasePage):
+    SYNC_PAGE = CheckoutCompletePage
+
+    async def is_complete(self, timeout: int = 5000) -> bool:
+        outcomes = {'complete': self._loc(self.COMPLETE_HEADER), 'error': self._loc(self.ERROR_MESSAGE)}
+        return await self.wait_for_outcome(outcomes, timeout=timeout) == 'complete'
+
+    async def get_complete_text(self) -> str:
+        return await self.get_element(self._loc(self.COMPLETE_TEXT)).inner_text()
+
+    async def back_to_products(self):
+        await self.click_element(self._loc(self.BACK_HOME))
@@ -0,0 +1,23 @@
+from typing import List
+from test_client.pages.sauce_demo.checkout.cart_state import cart_seed_script
+
+
+class CartMixin:
+    """Cart badge and cart seeding shared by the page objects showing the header cart (mix in before BasePage)."""
+
+    CART_BADGE = 'cart_badge'
+
+    def seed_cart(self, names: List[str]):
+        """Put `names` in the cart through the app's localStorage instead of add-to-cart clicks (applied on the next document load)."""
+        self.page.add_init_script(script=cart_seed_script(self.base_url, names))
+
+    def open_with_cart(self, names: List[str]) -> int:
+        """Seed the cart with `names`, load the page (URL_PATH) and return the badge count."""
+        self.seed_cart(names)
+        self.navigate(force=True)
+        return self.get_cart_count()
+
+    def get_cart_count(self) -> int:
+        # badge is absent for an empty cart; one evaluate instead of count() + inner_text()
+        text = self.read_many({'badge': self._loc(self.CART_BADGE)})['badge']
+        return int(text) if text else 0
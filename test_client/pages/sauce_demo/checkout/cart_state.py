@@ -0,0 +1,41 @@
+import json
+import uuid
+from typing import Iterable, List
+from urllib.parse import urlsplit
+
+# Sauce Demo product ids as stored in the app's `cart-contents` localStorage entry
+PRODUCT_IDS = {
+    'Sauce Labs Backpack': 4,
+    'Sauce Labs Bike Light': 0,
+    'Sauce Labs Bolt T-Shirt': 1,
+    'Sauce Labs Fleece Jacket': 5,
+    'Sauce Labs Onesie': 2,
+    'Test.allTheThings() T-Shirt (Red)': 3,
+}
+CART_STORAGE_KEY = 'cart-contents'
+
+# Runs before any page script of every document; writes the cart once per tab (sessionStorage marker), on the app's origin only,
+# so later add/remove clicks and the cart reset on checkout are not overwritten by the next navigation
+_SEED_CART_JS = """
+(([origin, key, ids, marker]) => {
+  if (window.location.origin !== origin || sessionStorage.getItem(marker)) return;
+  if (ids.length) localStorage.setItem(key, JSON.stringify(ids));
+  else localStorage.removeItem(key);
+  sessionStorage.setItem(marker, '1');
+})(%s);
+"""
+
+
+def product_ids(names: Iterable[str]) -> List[int]:
+    unknown = [name for name in names if name not in PRODUCT_IDS]
+    if unknown:
+        raise KeyError(f'Unknown products {unknown}; known: {sorted(PRODUCT_IDS)}')
+    return [PRODUCT_IDS[name] for name in names]
+
+
+def cart_seed_script(base_url: str, names: Iterable[str]) -> str:
+    """Init script that puts `names` into the cart of the app at `base_url` on the next document load."""
+    parts = urlsplit(base_url)
+    # a marker per script: a later seed on the same page still applies once
+    arg = [f'{parts.scheme}://{parts.netloc}', CART_STORAGE_KEY, product_ids(list(names)), f'ui-cart-seeded-{uuid.uuid4().hex}']
+    return _SEED_CART_JS % json.dumps(arg)
@@ -1,23 +1,18 @@
 from test_client.pages.base_page import BasePage
-from test_client.util.util import get_locator
 
 
 class CheckoutCompletePage(BasePage):
+    LOCATOR_PAGE = 'checkout_complete_page'
+    URL_PATH = 'checkout-complete.html'
     COMPLETE_HEADER = 'complete_header'
     COMPLETE_TEXT = 'complete_text'
     BACK_HOME = 'back_home'
+    ERROR_MESSAGE = 'error_message'
 
-    def _loc(self, key: str) -> str:
-        return get_locator('checkout_complete_page', key)
-
-    def navigate(self, path: str = 'checkout-complete.html'):
-        super().navigate(path)
-
-    def is_complete(self) -> bool:
-        try:
-            return self.get_element(self._loc(self.COMPLETE_HEADER)).is_visible()
-        except Exception:
-            return False
+    def is_complete(self, timeout: int = 5000) -> bool:
+        # waits for the completion header, but gives up as soon as an error banner shows instead
+        outcomes = {'complete': self._loc(self.COMPLETE_HEADER), 'error': self._loc(self.ERROR_MESSAGE)}
+        return self.wait_for_outcome(outcomes, timeout=timeout) == 'complete'
 
     def get_complete_text(self) -> str:
         return self.get_element(self._loc(self.COMPLETE_TEXT)).inner_text()
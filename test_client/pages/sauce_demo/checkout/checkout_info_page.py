@@ -1,20 +1,15 @@
 from test_client.pages.base_page import BasePage
-from test_client.util.util import get_locator
 
 
 class CheckoutInfoPage(BasePage):
+    LOCATOR_PAGE = 'checkout_info_page'
+    URL_PATH = 'checkout-step-one.html'
     FIRST_NAME = 'first_name'
     LAST_NAME = 'last_name'
     POSTAL_CODE = 'postal_code'
     CONTINUE_BUTTON = 'continue_button'
     CANCEL_BUTTON = 'cancel_button'
 
-    def _loc(self, key: str) -> str:
-        return get_locator('checkout_info_page', key)
-
-    def navigate(self, path: str = 'checkout-step-one.html'):
-        super().navigate(path)
-
     def fill_checkout_info(self, first_name: str, last_name: str, postal_code: str):
         self.fill_input(self._loc(self.FIRST_NAME), first_name)
         self.fill_input(self._loc(self.LAST_NAME), last_name)
@@ -1,9 +1,10 @@
-from typing import List
+from typing import Dict, List
 from test_client.pages.base_page import BasePage
-from test_client.util.util import get_locator
 
 
 class CheckoutOverviewPage(BasePage):
+    LOCATOR_PAGE = 'checkout_overview_page'
+    URL_PATH = 'checkout-step-two.html'
     ITEM_NAME = 'item_name'
     SUMMARY_SUBTOTAL = 'summary_subtotal'
     SUMMARY_TAX = 'summary_tax'
@@ -11,14 +12,8 @@ class CheckoutOverviewPage(BasePage):
     FINISH_BUTTON = 'finish_button'
     CANCEL_BUTTON = 'cancel_button'
 
-    def _loc(self, key: str) -> str:
-        return get_locator('checkout_overview_page', key)
-
-    def navigate(self, path: str = 'checkout-step-two.html'):
-        super().navigate(path)
-
     def get_item_names(self) -> List[str]:
-        return self.page.locator(self._loc(self.ITEM_NAME)).all_text_contents()
+        return self.get_element(self._loc(self.ITEM_NAME)).all_text_contents()
 
     def get_subtotal(self) -> str:
         return self.get_element(self._loc(self.SUMMARY_SUBTOTAL)).inner_text()
@@ -29,6 +24,11 @@ class CheckoutOverviewPage(BasePage):
     def get_total(self) -> str:
         return self.get_element(self._loc(self.SUMMARY_TOTAL)).inner_text()
 
+    def get_summary(self) -> Dict[str, str]:
+        # subtotal, tax and total label texts in a single round trip
+        keys = {'subtotal': self.SUMMARY_SUBTOTAL, 'tax': self.SUMMARY_TAX, 'total': self.SUMMARY_TOTAL}
+        return self.read_many({name: self._loc(key) for name, key in keys.items()}, wait_for_all=True)
+
     def finish_checkout(self):
         self.click_element(self._loc(self.FINISH_BUTTON))
 
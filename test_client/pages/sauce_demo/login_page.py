@@ -1,9 +1,10 @@
-from playwright.sync_api import expect
-from test_client.pages.base_page import BasePage
-from test_client.util.util import get_locator
+from typing import Optional, Sequence
+from test_client.pages.base_page import BasePage, expect
 
 
 class LoginPage(BasePage):
+    LOCATOR_PAGE = 'login_page'
+    URL_PATH = ''
     # keys only
     USERNAME = 'username'
     PASSWORD = 'password'
@@ -13,13 +14,6 @@ class LoginPage(BasePage):
     MENU_BUTTON = 'menu_button'
     LOGOUT_LINK = 'logout_link'
 
-    def _loc(self, key: str) -> str:
-        return get_locator('login_page', key)
-
-    def navigate(self, path: str = ''):
-        # navigate to the project base_url (pytest.ini) root or a given path
-        super().navigate(path)
-
     def login(self, username: str, password: str):
         # fill credentials and submit
         self.fill_input(self._loc(self.USERNAME), username)
@@ -29,19 +23,20 @@ class LoginPage(BasePage):
     def login_and_verify(self, username: str, password: str, timeout: int = 5000):
         # perform login and verify inventory page is visible
         self.login(username, password)
-        expect(self.page.locator(self._loc(self.INVENTORY_CONTAINER))).to_be_visible(timeout=timeout)
+        expect(self.get_element(self._loc(self.INVENTORY_CONTAINER))).to_be_visible(timeout=timeout)
 
     def get_error_text(self) -> str:
         # return visible error message text after failed login
         return self.get_element(self._loc(self.ERROR_MESSAGE)).inner_text()
 
+    def wait_for_login_outcome(self, timeout: int = 5000, outcomes: Sequence[str] = ('inventory', 'error')) -> Optional[str]:
+        # first of `outcomes` reached, checked in that order (None on timeout): 'inventory', 'error' or 'login' (the form).
+        # The form stays visible after a submit until a successful login navigates away, so 'login' is for checks after logout()
+        keys = {'inventory': self.INVENTORY_CONTAINER, 'error': self.ERROR_MESSAGE, 'login': self.LOGIN_BUTTON}
+        return self.wait_for_outcome({name: self._loc(keys[name]) for name in outcomes}, timeout=timeout)
+
     def is_logged_in(self, timeout: int = 2000) -> bool:
-        # quick check if login succeeded by checking inventory container visibility
-        try:
-            expect(self.page.locator(self._loc(self.INVENTORY_CONTAINER))).to_be_visible(timeout=timeout)
-            return True
-        except Exception:
-            return False
+        return self.wait_for_login_outcome(timeout) == 'inventory'
 
     def logout(self):
         self.click_element(self._loc(self.MENU_BUTTON))
@@ -49,4 +44,4 @@ class LoginPage(BasePage):
 
     def logout_and_verify(self, timeout: int = 5000):
         self.logout()
-        expect(self.page.locator(self._loc(self.USERNAME))).to_be_visible(timeout=timeout)
+        expect(self.get_element(self._loc(self.USERNAME))).to_be_visible(timeout=timeout)
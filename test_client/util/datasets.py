@@ -0,0 +1,138 @@
+"""Tabular test data from config/data: streamed row by row, cached per file mtime, filterable and shardable."""
+
+from __future__ import annotations
+import csv
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from test_client.util.impact import record_file
+
+Row = Dict[str, Any]
+
+# (path, shard) -> (mtime_ns, size, rows): a dataset is parsed once per process until the file changes
+__DATASET_CACHE: Dict[Tuple[str, Tuple[int, int]], Tuple[int, int, Tuple[Row, ...]]] = {}
+__LOCK = threading.Lock()
+
+# optional column holding comma-separated tags (also applied as pytest marks by tests/fixtures/datasets.py)
+TAGS_COLUMN = 'tags'
+
+
+class DatasetError(ValueError):
+    """A dataset file is missing, has an unsupported format or malformed rows."""
+
+
+def data_dir() -> Path:
+    return Path(__file__).resolve().parents[2] / 'config' / 'data'
+
+
+def dataset_path(name: str) -> Path:
+    path = Path(name)
+    return path if path.is_absolute() else data_dir() / path
+
+
+def _csv_rows(path: Path, shard: Tuple[int, int]) -> Iterator[Row]:
+    index, count = shard
+    with path.open(newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        for n, values in enumerate(reader):
+            if n % count == index:
+                yield dict(zip(header, values))
+
+
+def _jsonl_rows(path: Path, shard: Tuple[int, int]) -> Iterator[Row]:
+    index, count = shard
+    with path.open(encoding='utf-8') as f:
+        n = -1
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            n += 1
+            # rows of other shards are skipped before json.loads
+            if n % count != index:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                raise DatasetError(f'{path}:{line_no}: invalid JSON ({exc})') from exc
+            if not isinstance(row, dict):
+                raise DatasetError(f'{path}:{line_no}: expected an object per line')
+            yield row
+
+
+def _yaml_rows(path: Path, shard: Tuple[int, int]) -> Iterator[Row]:
+    # a top-level list of mappings, or one mapping per YAML document ('---' separated, parsed one at a time)
+    import yaml
+
+    index, count = shard
+    n = -1
+    with path.open(encoding='utf-8') as f:
+        for document in yaml.safe_load_all(f):
+            for row in document if isinstance(document, list) else [document]:
+                if row is None:
+                    continue
+                if not isinstance(row, dict):
+                    raise DatasetError(f'{path}: expected mappings as rows, got {type(row).__name__}')
+                n += 1
+                if n % count == index:
+                    yield row
+
+
+_READERS = {'.csv': _csv_rows, '.jsonl': _jsonl_rows, '.yaml': _yaml_rows, '.yml': _yaml_rows}
+
+
+def iter_rows(name: str, shard: Tuple[int, int] = (0, 1)) -> Iterator[Row]:
+    """
+    Stream the rows of a dataset (CSV, JSONL or YAML by extension) without caching.
+    `shard` = (index, count) keeps every count-th row starting at index.
+    """
+    path = dataset_path(name)
+    record_file(path)
+    reader = _READERS.get(path.suffix.lower())
+    if reader is None:
+        raise DatasetError(f'Unsupported dataset format: {path.name} (expected one of {", ".join(sorted(_READERS))})')
+    if not path.is_file():
+        raise DatasetError(f'Dataset not found: {path}')
+    return reader(path, shard)
+
+
+def row_tags(row: Row) -> Tuple[str, ...]:
+    value = row.get(TAGS_COLUMN) or ()
+    if isinstance(value, str):
+        value = value.split(',')
+    return tuple(str(tag).strip() for tag in value if str(tag).strip())
+
+
+def load_rows(name: str, tags: Optional[Iterable[str]] = None, shard: Tuple[int, int] = (0, 1)) -> List[Row]:
+    """Rows of a dataset, parsed once per process and file version; with `tags`, only rows carrying any of them."""
+    path = dataset_path(name)
+    record_file(path)
+    key = (str(path), shard)
+    try:
+        stat = path.stat()
+    except OSError as exc:
+        raise DatasetError(f'Dataset not found: {path}') from exc
+    with __LOCK:
+        cached = __DATASET_CACHE.get(key)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            cached = __DATASET_CACHE[key] = (stat.st_mtime_ns, stat.st_size, tuple(iter_rows(name, shard)))
+    rows = cached[2]
+    if tags:
+        wanted = set(tags)
+        rows = [row for row in rows if wanted.intersection(row_tags(row))]
+    return list(rows)
+
+
+def columns(rows: Sequence[Row], argnames: Sequence[str]) -> List[Tuple[Any, ...]]:
+    """Project rows onto `argnames`; a missing column is an error rather than a silent None."""
+    values = []
+    for n, row in enumerate(rows):
+        missing = [name for name in argnames if name not in row]
+        if missing:
+            raise DatasetError(f'Row {n} has no column(s) {", ".join(missing)}')
+        values.append(tuple(row[name] for name in argnames))
+    return values
@@ -0,0 +1,105 @@
+"""What the running test touches: page object source files, locator keys and dataset files (test impact analysis)."""
+
+from __future__ import annotations
+import functools
+import sys
+import types
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Set, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# locator dependencies are recorded as 'locator:<page>.<key>'; everything else is a path relative to PROJECT_ROOT
+LOCATOR_PREFIX = 'locator:'
+PAGES_PACKAGE = 'test_client.pages.'
+
+# dependencies of the test running in this process, None when not recording; tests run one at a time per
+# process, so a plain global (unlike a ContextVar) also sees page objects driven from the asyncio runner thread
+_active: Optional[Set[str]] = None
+
+
+def start_recording() -> Set[str]:
+    global _active
+    _active = set()
+    return _active
+
+
+def stop_recording() -> Set[str]:
+    global _active
+    deps, _active = _active or set(), None
+    return deps
+
+
+@contextmanager
+def recording_scope() -> Iterator[Set[str]]:
+    """Collect what the block touches on its own (e.g. one fixture's setup); it still counts for the running test."""
+    global _active
+    outer = _active
+    deps = _active = set()
+    try:
+        yield deps
+    finally:
+        _active = outer
+        if outer is not None:
+            outer.update(deps)
+
+
+def locator_dep(page_name: str, key: str) -> str:
+    return f'{LOCATOR_PREFIX}{page_name}.{key}'
+
+
+def file_dep(path: Path) -> Optional[str]:
+    """`path` relative to the project root (posix), None for files outside it."""
+    try:
+        return Path(path).resolve().relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return None
+
+
+def record_locator(page_name: str, key: str):
+    if _active is not None:
+        _active.add(locator_dep(page_name, key))
+
+
+def record_file(path: Path):
+    if _active is not None:
+        dep = file_dep(path)
+        if dep:
+            _active.add(dep)
+
+
+@functools.lru_cache(maxsize=None)
+def module_files(module_name: str) -> Tuple[str, ...]:
+    """Project source file of the module plus those of the page modules it imports, directly or through another one
+    (helpers such as cart_state.py). Imported page object classes are left out: they count once a test uses them."""
+    files, pending = [], [module_name]
+    while pending:
+        module = sys.modules.get(pending.pop())
+        module_file = getattr(module, '__file__', None)
+        dep = file_dep(Path(module_file)) if module_file else None
+        if not dep or dep in files:
+            continue
+        files.append(dep)
+        for value in vars(module).values():
+            if isinstance(value, type) and hasattr(value, '_locator_keys'):
+                continue
+            name = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, '__module__', None)
+            if isinstance(name, str) and name.startswith(PAGES_PACKAGE):
+                pending.append(name)
+    return tuple(files)
+
+
+@functools.lru_cache(maxsize=None)
+def class_files(cls: type) -> Tuple[str, ...]:
+    """Project source files defining `cls` and its bases (and the page modules they import), plus the sync page
+    object an async one mirrors (SYNC_PAGE)."""
+    files = []
+    mirrored = getattr(cls, 'SYNC_PAGE', None)
+    for klass in cls.__mro__ + (mirrored.__mro__ if mirrored else ()):
+        files.extend(dep for dep in module_files(klass.__module__) if dep not in files)
+    return tuple(files)
+
+
+def record_class(cls: type):
+    if _active is not None:
+        _active.update(class_files(cls))
@@ -1,22 +1,197 @@
+import copy
+import json
 import logging
 import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import List, Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_EXC_FORMATTER = logging.Formatter()
+
+# {'nodeid', 'phase', 'records'} of the test currently running in this thread/task (see log_context)
+_log_context: ContextVar[dict] = ContextVar('ui_log_context', default={})
+
+
+class _ContextFilter(logging.Filter):
+    """Stamps records with nodeid/worker/phase."""
+
+    worker = os.getenv('PYTEST_XDIST_WORKER', 'main')
+
+    def filter(self, record):
+        context = _log_context.get()
+        record.nodeid = context.get('nodeid', '')
+        record.phase = context.get('phase', '')
+        record.worker = self.worker
+        return True
+
+
+class _SnapshotQueueHandler(QueueHandler):
+    """Enqueues a copy of the record with its message and traceback already rendered, and keeps it for the running
+    test's failure report.
+
+    Unlike the stdlib ``prepare``, the layout is left to the listener's formatters (console line or JSONL); only
+    ``args`` and ``exc_info`` are resolved here, so later changes to the arguments cannot alter the message and
+    traceback frames are not kept alive by the queue or the per-test record list.
+    """
+
+    def prepare(self, record):
+        prepared = copy.copy(record)
+        prepared.msg = record.getMessage()
+        prepared.args = None
+        if record.exc_info:
+            prepared.exc_text = record.exc_text or _EXC_FORMATTER.formatException(record.exc_info)
+        prepared.exc_info = None
+        records = _log_context.get().get('records')
+        if records is not None:
+            records.append(prepared)
+        return prepared
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg, nodeid, worker, phase (+ exc)."""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'nodeid': getattr(record, 'nodeid', ''),
+            'worker': getattr(record, 'worker', ''),
+            'phase': getattr(record, 'phase', ''),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RateLimitedStreamHandler(logging.StreamHandler):
+    """Console handler capped at `per_second` records (token bucket, 0 = unlimited); WARNING and above always pass.
+
+    The first record written after a burst is preceded by a note of how many were dropped.
+    """
+
+    def __init__(self, stream=None, per_second: int = 0):
+        super().__init__(stream)
+        self.per_second = per_second
+        self.tokens = float(per_second)
+        self.updated = time.monotonic()
+        self.dropped = 0
+
+    def emit(self, record):
+        if self.per_second > 0:
+            now = time.monotonic()
+            self.tokens = min(float(self.per_second), self.tokens + (now - self.updated) * self.per_second)
+            self.updated = now
+            if self.tokens < 1 and record.levelno < logging.WARNING:
+                self.dropped += 1
+                return
+            self.tokens = max(self.tokens - 1, 0.0)
+        if self.dropped:
+            note = logging.makeLogRecord(
+                {
+                    'name': __name__,
+                    'levelno': logging.WARNING,
+                    'levelname': 'WARNING',
+                    'msg': f'{self.dropped} log records suppressed (rate limit {self.per_second}/s)',
+                }
+            )
+            self.dropped = 0
+            super().emit(note)
+        super().emit(record)
+
+
+class _LogBackend:
+    """The shared QueueHandler every get_logger() logger writes to, and the listener thread draining it."""
+
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        self.handler = _SnapshotQueueHandler(self.queue)
+        self.handler.addFilter(_ContextFilter())
+        self.listener = None
+        self.lock = threading.Lock()
+        self.start()
+
+    def start(self, jsonl_path: Optional[Path] = None, rate_limit: int = 0):
+        console = RateLimitedStreamHandler(sys.stderr, rate_limit)
+        console.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers = [console]
+        if jsonl_path is not None:
+            jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+            jsonl = logging.FileHandler(jsonl_path, encoding='utf-8')
+            jsonl.setFormatter(JsonLinesFormatter())
+            handlers.append(jsonl)
+        with self.lock:
+            self._stop()
+            self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+            self.listener.start()
+
+    def _stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+
+
+_backend: Optional[_LogBackend] = None
+_backend_lock = threading.Lock()
+
+
+def _get_backend() -> _LogBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _LogBackend()
+        return _backend
+
+
+def configure_logging(jsonl_path: Optional[Path] = None, worker: Optional[str] = None, rate_limit: int = 0):
+    """(Re)start the listener: console output capped at `rate_limit` records/s, plus JSONL to `jsonl_path`."""
+    if worker:
+        _ContextFilter.worker = worker
+    _get_backend().start(jsonl_path, rate_limit)
+
+
+def shutdown_logging():
+    """Flush queued records and close the JSONL file; later records go to the console only."""
+    _get_backend().start()
+
+
+@contextmanager
+def log_context(nodeid: str, phase: str, records: Optional[List[logging.LogRecord]] = None):
+    """Tag records logged inside the block with `nodeid`/`phase`, and collect them into `records`."""
+    token = _log_context.set({'nodeid': nodeid, 'phase': phase, 'records': records})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def format_records(records: List[logging.LogRecord]) -> str:
+    formatter = JsonLinesFormatter()
+    return '\n'.join(formatter.format(record) for record in records)
 
 
 def get_logger(name: str) -> logging.Logger:
     log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
     # Create a logger
     logger = logging.getLogger(name)
     logger.setLevel(log_level)
 
-    # Create console handler
-    console_handler = logging.StreamHandler()
-    formatter = logging.Formatter(log_format)
-    console_handler.setFormatter(formatter)
-
-    # Add handlers to the logger
-    if not logger.handlers:  # Avoid adding duplicate handlers
-        logger.addHandler(console_handler)
+    # every logger shares one non-blocking queue handler; the listener thread formats and writes
+    backend = _get_backend()
+    if backend.handler not in logger.handlers:
+        logger.addHandler(backend.handler)
 
     return logger
@@ -0,0 +1,85 @@
+"""Startup benchmark: wall time of ``pytest --collect-only`` and import time per module.
+
+    python -m test_client.util.startup_benchmark --runs 5 --budget 3.0
+
+Collection never logs in, so missing credential variables are filled with
+placeholders. Exits with 1 when the median wall time exceeds ``--budget``.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+_OWN_PACKAGES = ('tests', 'test_client')
+_CREDENTIAL_VARS = ('APP_USER', 'APP_PASSWORD')
+
+
+def collect_once(pytest_args: List[str]) -> Tuple[float, str]:
+    """One ``pytest --collect-only`` run under ``-X importtime``: (wall seconds, importtime report)."""
+    env = dict(os.environ)
+    for name in _CREDENTIAL_VARS:
+        env.setdefault(name, 'startup-benchmark')
+    # -s: importtime writes to stderr, which pytest would otherwise capture while importing conftest plugins
+    cmd = [sys.executable, '-X', 'importtime', '-m', 'pytest', '--collect-only', '-q', '-s', *pytest_args]
+    started = time.perf_counter()
+    result = subprocess.run(cmd, cwd=_PROJECT_ROOT, env=env, capture_output=True, text=True, check=False)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise SystemExit(f'pytest --collect-only failed ({result.returncode}):\n{result.stdout[-2000:]}')
+    return elapsed, result.stderr
+
+
+def parse_importtime(report: str) -> Dict[str, Tuple[int, int, int]]:
+    """module -> (self us, cumulative us, nesting depth)."""
+    modules = {}
+    for line in report.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            modules[m.group(4)] = (int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2)
+    return modules
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='collection runs to take the median of')
+    parser.add_argument('--top', type=int, default=10, help='slowest third-party imports to list')
+    parser.add_argument('--budget', type=float, default=0.0, help='fail when the median wall time exceeds this many seconds (0 = no check)')
+    parser.add_argument('pytest_args', nargs='*', help='extra pytest arguments (e.g. --env offline)')
+    args = parser.parse_args(argv)
+
+    walls, report = [], ''
+    for _ in range(max(args.runs, 1)):
+        elapsed, report = collect_once(args.pytest_args)
+        walls.append(elapsed)
+    median = statistics.median(walls)
+    print(f'pytest --collect-only: median {median:.3f}s, min {min(walls):.3f}s over {len(walls)} run(s)')
+
+    modules = parse_importtime(report)
+    own = sorted(((name, t) for name, t in modules.items() if name.split('.')[0] in _OWN_PACKAGES), key=lambda kv: -kv[1][1])
+    print('\nproject modules (cumulative import time):')
+    for name, (_, cumulative, _) in own:
+        print(f'  {cumulative / 1000:8.1f} ms  {name}')
+    third_party = sorted(
+        ((name, t) for name, t in modules.items() if t[2] == 0 and name.split('.')[0] not in _OWN_PACKAGES), key=lambda kv: -kv[1][1]
+    )
+    print(f'\nslowest top-level imports (top {args.top}):')
+    for name, (_, cumulative, _) in third_party[: args.top]:
+        print(f'  {cumulative / 1000:8.1f} ms  {name}')
+
+    if args.budget and median > args.budget:
+        print(f'\nStartup budget exceeded: {median:.3f}s > {args.budget:.3f}s')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
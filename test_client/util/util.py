@@ -1,29 +1,100 @@
 from __future__ import annotations
+import functools
 from pathlib import Path
-from typing import Dict, Any, Iterable, Sequence
+from typing import Dict, Any, Iterable, List, Tuple
 import threading
-import yaml
+
+from test_client.util.impact import record_locator
 
 __LOCATORS_CACHE: Dict[str, Any] | None = None
+__LOCATOR_INDEX: Dict[Tuple[str, str], str] | None = None
 __LOCK = threading.Lock()
 
-_DEFAULT_PREFERENCE: Sequence[str] = ('id', 'css', 'xpath', 'role', 'text')
+# upper-case page object constants that are not locator keys
+PAGE_META_ATTRS = ('LOCATOR_PAGE', 'URL_PATH')
+
+
+class LocatorConfigError(ValueError):
+    """config/locators.yml cannot be compiled into a locator index (duplicate, empty or missing keys)."""
+
+
+@functools.lru_cache(maxsize=None)
+def _unique_key_loader():
+    # yaml is imported when locators are first loaded, not when page objects are imported
+    import yaml
+
+    class _UniqueKeyLoader(yaml.SafeLoader):
+        """SafeLoader that rejects duplicate mapping keys instead of silently keeping the last one."""
+
+        def construct_mapping(self, node, deep=False):
+            seen = set()
+            for key_node, _ in node.value:
+                key = self.construct_object(key_node, deep=deep)
+                if key in seen:
+                    raise LocatorConfigError(f"Duplicate key '{key}' in {_locators_path()} (line {key_node.start_mark.line + 1})")
+                seen.add(key)
+            return super().construct_mapping(node, deep=deep)
+
+    return _UniqueKeyLoader
 
 
 def _locators_path() -> Path:
     return Path(__file__).resolve().parents[2] / 'config' / 'locators.yml'
 
 
+def _normalize(loc_type: str, value: str) -> str:
+    # Normalize id to CSS id selector
+    if loc_type == 'id' and not value.startswith('#'):
+        return f'#{value}'
+    return value
+
+
+def compile_locators(data: Dict[str, Any]) -> Dict[Tuple[str, str], str]:
+    """
+    Flatten the locator map into a (page, key) -> selector index.
+    A key may only be defined once per page (across all locator types) and must have a selector.
+    """
+    index: Dict[Tuple[str, str], str] = {}
+    defined_as: Dict[Tuple[str, str], str] = {}
+    errors: List[str] = []
+    for page_name, page in data.items():
+        if not isinstance(page, dict):
+            errors.append(f"Page '{page_name}' must map locator types to keys")
+            continue
+        for loc_type, section in page.items():
+            for key, value in (section or {}).items():
+                if (page_name, key) in index:
+                    errors.append(f"Locator key '{key}' for page '{page_name}' defined twice ({defined_as[(page_name, key)]} and {loc_type})")
+                    continue
+                if not value:
+                    errors.append(f"Locator key '{key}' for page '{page_name}' has no selector")
+                    continue
+                index[(page_name, key)] = _normalize(loc_type, str(value))
+                defined_as[(page_name, key)] = loc_type
+    if errors:
+        raise LocatorConfigError(f'Invalid locators in {_locators_path()}:\n' + '\n'.join(errors))
+    return index
+
+
 def load_locators(force: bool = False) -> Dict[str, Any]:
-    global __LOCATORS_CACHE
+    global __LOCATORS_CACHE, __LOCATOR_INDEX
     if __LOCATORS_CACHE is None or force:
         with __LOCK:
             if __LOCATORS_CACHE is None or force:
+                import yaml
+
                 with _locators_path().open('r', encoding='utf-8') as f:
-                    __LOCATORS_CACHE = yaml.safe_load(f) or {}
+                    data = yaml.load(f, Loader=_unique_key_loader()) or {}
+                __LOCATOR_INDEX = compile_locators(data)
+                __LOCATORS_CACHE = data
     return __LOCATORS_CACHE
 
 
+def locator_index() -> Dict[Tuple[str, str], str]:
+    load_locators()
+    return __LOCATOR_INDEX
+
+
 def get_page_section(page_name: str) -> Dict[str, Dict[str, str]]:
     data = load_locators()
     page = data.get(page_name)
@@ -32,37 +103,60 @@ def get_page_section(page_name: str) -> Dict[str, Dict[str, str]]:
     return page
 
 
-def get_locator(page_name: str, key: str, prefer: Iterable[str] = _DEFAULT_PREFERENCE) -> str:
-    """
-    Resolve a locator by key for a page.
-    Preference order: css > id > xpath > role > text (configurable).
-    If type == id and value not prefixed, convert to '#value'.
-    """
-    page = get_page_section(page_name)
-    searched = set()
-    for loc_type in prefer:
-        section = page.get(loc_type)
-        if section and key in section:
-            value = section[key]
-            if loc_type == 'id':
-                # Normalize id to CSS id selector
-                if not value.startswith('#'):
-                    value = f'#{value}'
-            return value
-        if loc_type in page:
-            searched.add(loc_type)
-    # Fallback: search remaining types not in preference list
-    for loc_type, section in page.items():
-        if loc_type in searched:
-            continue
-        if key in section:
-            value = section[key]
-            if loc_type == 'id' and not value.startswith('#'):
-                value = f'#{value}'
-            return value
-    raise KeyError(f"Locator key '{key}' not found for page '{page_name}'")
+def get_locator(page_name: str, key: str) -> str:
+    """Resolve a locator by key for a page from the compiled index (ids already normalized to '#value')."""
+    record_locator(page_name, key)
+    try:
+        return locator_index()[(page_name, key)]
+    except KeyError:
+        get_page_section(page_name)
+        raise KeyError(f"Locator key '{key}' not found for page '{page_name}'") from None
+
+
+def bind_locators(page_name: str, keys: Iterable[str]) -> Dict[str, str]:
+    """Resolve all keys of a page object up front; every missing key is reported in one error."""
+    index = locator_index()
+    get_page_section(page_name)
+    missing = sorted(k for k in keys if (page_name, k) not in index)
+    if missing:
+        raise LocatorConfigError(f"Locator keys {missing} not found for page '{page_name}' in {_locators_path()}")
+    return {k: index[(page_name, k)] for k in keys}
 
 
 def list_keys(page_name: str) -> Dict[str, list[str]]:
     page = get_page_section(page_name)
     return {loc_type: list(keys.keys()) for loc_type, keys in page.items()}
+
+
+def validate_locators(package: str = 'test_client.pages') -> List[str]:
+    """
+    Import every page object module under `package` and check each class's resolved ``_locator_keys`` (keys
+    inherited from base classes and mixins included) against config/locators.yml.
+    Returns a list of problems (empty when everything resolves).
+    """
+    import importlib
+    import pkgutil
+
+    try:
+        index = locator_index()
+    except LocatorConfigError as e:
+        return [str(e)]
+    problems: List[str] = []
+    root = importlib.import_module(package)
+    modules = [root]
+    for info in pkgutil.walk_packages(root.__path__, f'{package}.'):
+        try:
+            modules.append(importlib.import_module(info.name))
+        except Exception as e:
+            problems.append(f'{info.name}: cannot be imported: {e}')
+    for module in sorted(modules, key=lambda m: m.__name__):
+        classes = (v for v in vars(module).values() if isinstance(v, type) and v.__module__ == module.__name__)
+        for cls in sorted(classes, key=lambda c: c.__name__):
+            page_name = getattr(cls, 'LOCATOR_PAGE', '')
+            if not page_name or not hasattr(cls, '_locator_keys'):
+                continue
+            for key in sorted(k for k in cls._locator_keys if (page_name, k) not in index):
+                # the constant may live on a mixin or base class; report it under the page class that uses it
+                names = sorted({n for klass in cls.__mro__ for n, v in vars(klass).items() if v == key and n.isupper() and n not in PAGE_META_ATTRS})
+                problems.append(f"{module.__name__}:{cls.__name__}.{'/'.join(names)} -> '{page_name}.{key}' not in {_locators_path().name}")
+    return problems
@@ -0,0 +1,154 @@
+"""Screenshot comparison against stored baselines: byte-digest fast path, then a NumPy per-pixel diff.
+
+numpy and Pillow are imported on the first comparison, not when page objects are imported.
+"""
+
+from __future__ import annotations
+import functools
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Sequence, Tuple
+
+from test_client.util.impact import PROJECT_ROOT, record_file
+
+Rect = Tuple[int, int, int, int]
+
+# per-channel difference (0-255) still counted as the same pixel: absorbs anti-aliasing and colour rounding
+PIXEL_TOLERANCE = 16
+
+_config = {'dir': PROJECT_ROOT / 'config' / 'baselines', 'update': False}
+
+
+class VisualMismatch(AssertionError):
+    """A screenshot differs from its baseline; carries the PNGs the failure report attaches."""
+
+    def __init__(self, message: str, name: str, actual_png: bytes, expected_png: Optional[bytes] = None, diff_png: Optional[bytes] = None):
+        super().__init__(message)
+        self.name = name
+        self.actual_png = actual_png
+        self.expected_png = expected_png
+        self.diff_png = diff_png
+
+
+@dataclass
+class VisualDiff:
+    identical: bool
+    changed_ratio: float = 0.0
+    size_mismatch: bool = False
+    # bool (height, width) array of the pixels that differ, None when identical or sizes differ
+    changed: Any = None
+    expected: Any = None
+
+    def diff_png(self) -> Optional[bytes]:
+        """The baseline dimmed to grey with the changed pixels in red."""
+        if self.changed is None:
+            return None
+        import numpy as np
+
+        grey = (self.expected.mean(axis=2) * 0.35).astype(np.uint8)
+        out = np.repeat(grey[:, :, None], 3, axis=2)
+        out[self.changed] = (255, 0, 0)
+        return _encode(out)
+
+
+def configure(baseline_dir: Path, update: bool = False):
+    """Where baselines live, and whether comparisons rewrite them (``--update-baselines``) instead of asserting."""
+    _config['dir'] = baseline_dir
+    _config['update'] = update
+
+
+def variant_of(page) -> str:
+    """'<browser>-<W>x<H>': baselines are kept per engine and viewport."""
+    browser = page.context.browser
+    viewport = page.viewport_size or {}
+    return f'{browser.browser_type.name if browser else "browser"}-{viewport.get("width", 0)}x{viewport.get("height", 0)}'
+
+
+def baseline_path(name: str, variant: str) -> Path:
+    return _config['dir'] / variant / f'{name}.png'
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _decode(png: bytes):
+    import numpy as np
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(png))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return np.asarray(image)
+
+
+def _encode(pixels) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG', compress_level=1)
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=32)
+def _load_baseline(path: str, mtime_ns: int):
+    # (png bytes, digest, pixels), decoded once per process and baseline version
+    png = Path(path).read_bytes()
+    return png, _digest(png), _decode(png)
+
+
+def compare(actual_png: bytes, expected_path: Path, ignore: Sequence[Rect] = ()) -> VisualDiff:
+    """Compare a PNG with the baseline at `expected_path`; `ignore` rectangles (x, y, w, h) are left out of the pixel diff."""
+    import numpy as np
+
+    expected_png, expected_digest, expected = _load_baseline(str(expected_path), expected_path.stat().st_mtime_ns)
+    if _digest(actual_png) == expected_digest:
+        return VisualDiff(identical=True)
+    actual = _decode(actual_png)
+    if actual.shape != expected.shape:
+        return VisualDiff(identical=False, changed_ratio=1.0, size_mismatch=True)
+    # |a - b| per channel without widening to int16, then the largest channel difference per pixel
+    # (elementwise over the channel planes: a reduction over the short last axis is an order of magnitude slower)
+    delta = np.maximum(actual, expected)
+    delta -= np.minimum(actual, expected)
+    changed = np.maximum(np.maximum(delta[..., 0], delta[..., 1]), delta[..., 2]) > PIXEL_TOLERANCE
+    for x, y, w, h in ignore:
+        changed[max(y, 0) : y + h, max(x, 0) : x + w] = False
+    changed_ratio = np.count_nonzero(changed) / changed.size
+    return VisualDiff(identical=False, changed_ratio=changed_ratio, changed=changed, expected=expected)
+
+
+def _write_baseline(path: Path, png: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_bytes(png)
+    os.replace(tmp, path)
+
+
+def assert_matches(actual_png: bytes, name: str, variant: str, threshold: float = 0.001, ignore: Sequence[Rect] = ()):
+    """Raise VisualMismatch when more than `threshold` of the pixels differ from baseline `name`, or when it is missing.
+
+    Baselines are only written with ``--update-baselines``: a missing one fails every attempt, so a retry cannot pass
+    against a screenshot the first attempt saved.
+    """
+    path = baseline_path(name, variant)
+    record_file(path)
+    if _config['update']:
+        _write_baseline(path, actual_png)
+        return
+    if not path.is_file():
+        raise VisualMismatch(
+            f'No baseline for {name!r} at {path}; run with --update-baselines to save this screenshot as the baseline', name, actual_png
+        )
+    diff = compare(actual_png, path, ignore)
+    if diff.identical or (not diff.size_mismatch and diff.changed_ratio <= threshold):
+        return
+    expected_png = _load_baseline(str(path), path.stat().st_mtime_ns)[0]
+    if diff.size_mismatch:
+        message = f'{name!r}: screenshot size differs from baseline {path}'
+    else:
+        message = f'{name!r} differs from baseline {path}: {diff.changed_ratio:.3%} of pixels changed (threshold {threshold:.3%})'
+    raise VisualMismatch(message, name, actual_png, expected_png, diff.diff_png())
@@ -5,18 +5,33 @@ from test_client.util.logger import get_logger
 log = get_logger(__name__)
 
 pytest_plugins = [
+    'tests.fixtures.scheduling',
     'tests.fixtures.hooks',
+    'tests.fixtures.log_capture',
+    'tests.fixtures.impact',
+    'tests.fixtures.datasets',
+    'tests.fixtures.video',
     'tests.fixtures.browser',
+    'tests.fixtures.async_browser',
+    'tests.fixtures.auth',
+    'tests.fixtures.offline',
+    'tests.fixtures.network',
 ]
 
 
 @pytest.fixture(scope='session')
-def valid_password(request):
+def settings(request):
+    """Resolved, typed ini settings for the active env (see tests/fixtures/settings.py)."""
+    return request.config._settings
+
+
+@pytest.fixture(scope='session')
+def valid_password(settings):
     """Resolved valid password from environment (never defaults)."""
-    return request.config._app_password
+    return settings.env_values.get('app_password')
 
 
 @pytest.fixture(scope='session')
-def standard_app_user(request):
+def standard_app_user(settings):
     """Resolved standard app user from environment (never defaults)."""
-    return request.config._standard_app_user
+    return settings.env_values.get('standard_app_user')
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Sequence
+import pytest
+
+from test_client.util.logger import get_logger
+from tests.fixtures.browser import launch_options
+
+log = get_logger(__name__)
+
+
+class AsyncRunner:
+    """An asyncio event loop on a dedicated thread; sync tests and fixtures submit coroutines to it.
+
+    The sync Playwright driver owns the main thread, so the asyncio driver
+    lives next to it instead of inside it.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='ui-asyncio', daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class AsyncBrowserPool:
+    """asyncio counterpart of BrowserPool: one warm ``playwright.async_api`` browser per launch options."""
+
+    def __init__(self):
+        self._playwright = None
+        self._browsers = {}
+        self._lock = None
+
+    async def acquire(self, browser_name: str, channel: str = '', headless: bool = True, slowmo: int = 0):
+        self._lock = self._lock or asyncio.Lock()
+        async with self._lock:
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+            key = (browser_name, channel, headless, slowmo)
+            browser = self._browsers.get(key)
+            if browser is None or not browser.is_connected():
+                browser_type, launch_kwargs = launch_options(browser_name, channel, headless, slowmo)
+                browser = self._browsers[key] = await getattr(self._playwright, browser_type).launch(**launch_kwargs)
+            return browser
+
+    async def close(self):
+        for browser in self._browsers.values():
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+class AsyncScenarios:
+    """Runs independent scenarios concurrently, each on a page in its own context of one shared browser.
+
+    ``run(scenario, cases)`` awaits ``scenario(page, *case)`` for every case,
+    at most ``concurrency`` at a time, and fails with every failing case listed.
+    """
+
+    def __init__(self, runner: AsyncRunner, browser, context_kwargs: dict, concurrency: int):
+        self.runner = runner
+        self.browser = browser
+        self.context_kwargs = context_kwargs
+        self.concurrency = max(1, concurrency)
+
+    @property
+    def logged_in(self) -> bool:
+        """True when contexts start from the cached login storage state."""
+        return 'storage_state' in self.context_kwargs
+
+    def run(self, scenario: Callable[..., Awaitable], cases: Iterable[Sequence]) -> List[Any]:
+        return self.runner.run(self._run_all(scenario, [tuple(case) for case in cases]))
+
+    async def _run_all(self, scenario, cases):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_case(case):
+            async with semaphore:
+                context = await self.browser.new_context(**self.context_kwargs)
+                try:
+                    return await scenario(await context.new_page(), *case)
+                finally:
+                    await context.close()
+
+        results = await asyncio.gather(*(run_case(case) for case in cases), return_exceptions=True)
+        failures = [(case, result) for case, result in zip(cases, results) if isinstance(result, BaseException)]
+        if failures:
+            details = '\n'.join(f'  {case!r}: {type(exc).__name__}: {exc}' for case, exc in failures)
+            raise AssertionError(f'{len(failures)} of {len(cases)} scenarios failed:\n{details}') from failures[0][1]
+        return results
+
+
+@pytest.fixture(scope='session')
+def async_runner():
+    runner = AsyncRunner()
+    yield runner
+    runner.close()
+
+
+@pytest.fixture(scope='session')
+def async_browser_pool(async_runner, install_playwright):
+    pool = AsyncBrowserPool()
+    yield pool
+    async_runner.run(pool.close())
+
+
+def _context_kwargs(settings, auth_storage_state) -> dict:
+    viewport_w, viewport_h = settings.viewport
+    context_kwargs = {'viewport': {'width': viewport_w, 'height': viewport_h}}
+    if auth_storage_state:
+        context_kwargs['storage_state'] = auth_storage_state
+    return context_kwargs
+
+
+@pytest.fixture
+def async_scenarios(settings, async_runner, async_browser_pool, browser_engine, auth_storage_state):
+    """Concurrent scenarios (``playwright.async_api`` pages) in one worker; see AsyncScenarios.
+
+    Contexts share the env's viewport and cached login; video, tracing and
+    request routing stay with the sync ``page`` fixture.
+    """
+    browser = async_runner.run(async_browser_pool.acquire(*browser_engine, settings.headless, settings.slowmo))
+    return AsyncScenarios(async_runner, browser, _context_kwargs(settings, auth_storage_state), settings.async_concurrency)
+
+
+@pytest.fixture
+def async_page(settings, async_runner, async_browser_pool, browser_engine, auth_storage_state):
+    """A ``playwright.async_api`` Page in a fresh context; drive it with ``async_runner.run(...)``."""
+    browser = async_runner.run(async_browser_pool.acquire(*browser_engine, settings.headless, settings.slowmo))
+    context = async_runner.run(browser.new_context(**_context_kwargs(settings, auth_storage_state)))
+    yield async_runner.run(context.new_page())
+    async_runner.run(context.close())
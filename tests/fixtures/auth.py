@@ -0,0 +1,79 @@
+import hashlib
+import os
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+import pytest
+
+from test_client.pages.sauce_demo.login_page import LoginPage
+from test_client.util.logger import get_logger
+from tests.fixtures.scheduling import get_worker_id
+from tests.fixtures.timing import timed
+
+log = get_logger(__name__)
+
+
+class StorageStateCache:
+    """Logged-in Playwright storage state per user, saved to disk and reused until its TTL expires.
+
+    Each xdist worker keeps its own files, so a user is logged in through
+    ``LoginPage`` at most once per worker per TTL window.
+    """
+
+    def __init__(self, cache_dir: Path, ttl: int, worker: str):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.worker = worker
+
+    def path_for(self, user: str, base_url: str, engine: str = '') -> Path:
+        # cookies belong to the app origin and storage state files differ per engine: both are part of the key
+        parts = urlsplit(base_url)
+        key = hashlib.sha1(f'{parts.scheme}://{parts.netloc}|{engine}'.encode()).hexdigest()[:12]
+        return self.cache_dir / f'{self.worker}-{user}-{key}.json'
+
+    def is_fresh(self, path: Path) -> bool:
+        return path.is_file() and time.time() - path.stat().st_mtime < self.ttl
+
+    def get(self, user: str, password: str, browser, base_url: str, engine: str = '') -> str:
+        path = self.path_for(user, base_url, engine)
+        if not self.is_fresh(path):
+            self._login_and_save(user, password, browser, base_url, path)
+        return str(path)
+
+    def _login_and_save(self, user: str, password: str, browser, base_url: str, path: Path):
+        log.info('Caching login storage state user=%s path=%s', user, path)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        context = browser.new_context()
+        try:
+            login = LoginPage(context.new_page(), base_url.rstrip('/'))
+            login.navigate()
+            login.login_and_verify(user, password)
+            tmp = path.with_suffix('.tmp')
+            context.storage_state(path=str(tmp))
+            os.replace(tmp, path)
+        finally:
+            context.close()
+
+
+@pytest.fixture(scope='session')
+def auth_cache(request, settings):
+    cache_dir = Path.cwd() / settings.auth_cache_dir
+    ttl = settings.auth_cache_ttl
+    return StorageStateCache(cache_dir, ttl, get_worker_id(request.config))
+
+
+@pytest.fixture
+def auth_storage_state(request, settings, app_base_url, auth_cache, browser_pool, browser_engine, standard_app_user, valid_password):
+    """Path to a cached logged-in storage state for this test, or None when the test starts logged out.
+
+    Opt out with ``@pytest.mark.no_auth_cache``; pick a user other than the
+    standard one with ``@pytest.mark.auth_user('name')``.
+    """
+    if not settings.auth_cache or request.node.get_closest_marker('no_auth_cache'):
+        return None
+    user_marker = request.node.get_closest_marker('auth_user')
+    user = user_marker.args[0] if user_marker else standard_app_user
+    with timed(request.node, 'browser_launch'):
+        browser = browser_pool.acquire(*browser_engine, settings.headless, settings.slowmo)
+    with timed(request.node, 'login'):
+        return auth_cache.get(user, valid_password, browser, app_base_url, '-'.join(filter(None, browser_engine)))
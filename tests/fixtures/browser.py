@@ -1,42 +1,138 @@
+import importlib.metadata
+import json
+import os
 import re
 import subprocess
+import tempfile
 import time
-import shutil
 from pathlib import Path
+from typing import List, Optional, Tuple
 import pytest
-from playwright.sync_api import sync_playwright
 import allure
 from allure_commons.types import AttachmentType
 
+from test_client.pages.base_page import navigation_stats
+from test_client.util.file_lock import file_lock
 from test_client.util.logger import get_logger
+from tests.fixtures.hooks import record_environment, item_failed
+from tests.fixtures.screenshots import capture_screenshot
+from tests.fixtures.timing import add_phase_time, timed
+from tests.fixtures.video import reserve_attachment
 
 log = get_logger(__name__)
 
 
-@pytest.fixture(scope='session', autouse=True)
-def install_playwright(request):
-    config_value = get_config_values(request)
-    browser_name = config_value('browser').lower()
-    subprocess_command_parts = ['playwright', 'install', browser_name]
-    if _bool(config_value('headless')):
-        subprocess_command_parts.append('--only-shell')
-    subprocess.run(subprocess_command_parts, check=False)
+@pytest.fixture(scope='session')
+def install_playwright(request, settings):
+    # requested by the fixtures that start Playwright: sessions without browser tests skip it entirely
+    only_shell = settings.headless
+    started = time.perf_counter()
+    for browser_name in settings.engines():
+        returncode = _install_browser(_install_state_dir(request.config), browser_name, only_shell)
+        if returncode is None:
+            log.info('Playwright install for %s skipped (stamp up to date)', browser_name)
+        elif returncode:
+            log.error('Playwright install for %s failed with exit code %s; launching it will likely fail', browser_name, returncode)
+        else:
+            log.info('Playwright install for %s ran', browser_name)
+    elapsed = time.perf_counter() - started
+    log.info('Playwright install finished in %.2fs', elapsed)
+    record_environment(request.config, 'playwright_install_seconds', f'{elapsed:.2f}')
 
 
-def _final(config, key):
-    return config._env_overrides.get(key, config.getini(key))
+def _install_state_dir(config) -> Path:
+    cache = getattr(config, 'cache', None)
+    if cache is not None:
+        return Path(cache.mkdir('playwright-install'))
+    return Path(tempfile.gettempdir()) / 'playwright-install'
 
 
-def _bool(v: str) -> bool:
-    return str(v).strip().lower() in ('1', 'true', 'yes', 'on')
+def _install_locations(command_parts) -> List[str]:
+    """Directories `playwright install` puts the browser (and its dependencies such as ffmpeg) in, from its --dry-run output."""
+    result = subprocess.run([*command_parts, '--dry-run'], check=False, capture_output=True, text=True)
+    if result.returncode != 0:
+        return []
+    return re.findall(r'^\s*Install location:\s*(.+?)\s*$', result.stdout, re.MULTILINE)
 
 
-def _parse_viewport(v: str):
-    try:
-        w, h = v.lower().split('x')
-        return int(w), int(h)
-    except Exception:
-        return 1280, 720
+def _install_browser(state_dir: Path, browser_name: str, only_shell: bool) -> Optional[int]:
+    """Run `playwright install` unless the stamp for this Playwright version/browser/--only-shell/browsers path matches
+    and the directories it installed into still exist.
+
+    The stamp is checked again under a file lock, so with xdist only the first
+    worker installs while the others wait and then skip. Returns the exit code
+    of the subprocess, None when it did not run.
+    """
+    stamp = {
+        'playwright': importlib.metadata.version('playwright'),
+        'browser': browser_name,
+        'only_shell': only_shell,
+        'browsers_path': os.environ.get('PLAYWRIGHT_BROWSERS_PATH', ''),
+    }
+    stamp_file = state_dir / f'{_sanitize_filename(browser_name)}{"-shell" if only_shell else ""}.json'
+
+    def up_to_date():
+        try:
+            saved = json.loads(stamp_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return False
+        # a cleared browser cache (or a restored pytest cache on a fresh CI image) must trigger a reinstall
+        locations = saved.pop('locations', None)
+        return saved == stamp and bool(locations) and all(Path(location).is_dir() for location in locations)
+
+    if up_to_date():
+        return None
+    with file_lock(state_dir / 'install.lock'):
+        if up_to_date():
+            return None
+        subprocess_command_parts = ['playwright', 'install', browser_name]
+        if only_shell:
+            subprocess_command_parts.append('--only-shell')
+        result = subprocess.run(subprocess_command_parts, check=False)
+        if result.returncode == 0:
+            stamp['locations'] = _install_locations(subprocess_command_parts)
+            stamp_file.write_text(json.dumps(stamp), encoding='utf-8')
+    return result.returncode
+
+
+def resolve_engine(spec: str, channel: str = '') -> Tuple[str, str]:
+    """(browser_name, channel) for a browser spec: an engine name, or a chromium channel such as chrome or msedge."""
+    spec = spec.strip().lower()
+    if spec in ('firefox', 'webkit'):
+        return spec, ''
+    if spec == 'chromium':
+        return 'chromium', channel
+    return 'chromium', spec
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    # --browsers: every page test runs once per engine through pytest-playwright's own browser_name parameter, so the
+    # test ids carry one browser ([firefox]) rather than its default next to ours ([chromium-firefox])
+    if config._settings.browsers:
+        config.option.browser = list(config._settings.browsers)
+
+
+def pytest_generate_tests(metafunc):
+    # pytest-playwright only parametrizes tests using its own fixtures (page, context, ...); async_page and
+    # async_scenarios reach a browser through browser_engine alone
+    settings = metafunc.config._settings
+    if settings.browsers and 'browser_engine' in metafunc.fixturenames and 'browser_name' not in metafunc.fixturenames:
+        metafunc.fixturenames.append('browser_name')
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    # run each engine's tests back to back, so a worker switches browsers as rarely as possible (quarantined tests still last)
+    engines = config._settings.browsers
+    if engines:
+        items.sort(key=lambda item: (item.get_closest_marker('quarantine') is not None, _engine_rank(item, engines)))
+
+
+def _engine_rank(item, engines) -> int:
+    callspec = getattr(item, 'callspec', None)
+    engine = callspec.params.get('browser_name') if callspec else None
+    return engines.index(engine) if engine in engines else -1
 
 
 def _sanitize_filename(name: str) -> str:
@@ -45,98 +141,199 @@ def _sanitize_filename(name: str) -> str:
     return name
 
 
+def _should_trace(policy: str, item) -> bool:
+    if policy == 'retain-on-first-retry':
+        # pytest-rerunfailures style counter: 1 for the first run, 2 for the first retry
+        return getattr(item, 'execution_count', 1) == 2
+    return policy in ('always', 'on-failure')
+
+
+def _finish_trace(context, policy: str, item, path: Path):
+    """Stop tracing; the zip is only written (and attached to Allure) when the policy keeps it."""
+    if policy == 'on-failure' and not item_failed(item):
+        context.tracing.stop()
+        return
+    context.tracing.stop(path=str(path))
+    try:
+        allure.attach.file(str(path), name=f'Trace - {item.name}', attachment_type=AttachmentType.ZIP)
+    except Exception:
+        pass
+
+
+def launch_options(browser_name: str, channel: str = '', headless: bool = True, slowmo: int = 0) -> Tuple[str, dict]:
+    """(Playwright browser type attribute, launch kwargs); unknown engines fall back to chromium."""
+    if browser_name not in ('firefox', 'webkit'):
+        browser_name = 'chromium'
+    launch_kwargs = {'headless': headless}
+    if browser_name == 'chromium' and channel:
+        launch_kwargs['channel'] = channel
+    if slowmo:
+        launch_kwargs['slow_mo'] = slowmo
+    log.info('Launching browser %s channel=%s headless=%s slowmo=%s', browser_name, channel or '-', headless, slowmo)
+    return browser_name, launch_kwargs
+
+
+class BrowserPool:
+    """Warm Browser instances shared by every test of the session (one pool per xdist worker).
+
+    Browsers are keyed by their launch options, so tests asking for the same
+    engine/channel/headless/slowmo combination reuse the same process and only
+    pay for a fresh ``BrowserContext``.
+    """
+
+    def __init__(self, playwright):
+        self._playwright = playwright
+        self._browsers = {}
+
+    def launch(self, browser_name: str, channel: str = '', headless: bool = True, slowmo: int = 0):
+        browser_name, launch_kwargs = launch_options(browser_name, channel, headless, slowmo)
+        return getattr(self._playwright, browser_name).launch(**launch_kwargs)
+
+    def acquire(self, browser_name: str, channel: str = '', headless: bool = True, slowmo: int = 0):
+        key = (browser_name, channel, headless, slowmo)
+        browser = self._browsers.get(key)
+        if browser is None or not browser.is_connected():
+            browser = self.launch(browser_name, channel, headless, slowmo)
+            self._browsers[key] = browser
+        return browser
+
+    def close(self):
+        for browser in self._browsers.values():
+            try:
+                browser.close()
+            except Exception:
+                pass
+        self._browsers.clear()
+
+
+@pytest.fixture(scope='session')
+def playwright_session(install_playwright):
+    """Single Playwright driver for the whole session (per xdist worker)."""
+    from playwright.sync_api import sync_playwright
+
+    p = sync_playwright().start()
+    yield p
+    p.stop()
+
+
+@pytest.fixture(scope='session')
+def browser_pool(playwright_session):
+    pool = BrowserPool(playwright_session)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def browser_engine(request, settings) -> Tuple[str, str]:
+    """(browser_name, channel) of the test: its --browsers parameter, else the `browser`/`channel` ini keys."""
+    if not settings.browsers:
+        return resolve_engine(settings.browser, settings.channel)
+    spec = request.getfixturevalue('browser_name')
+    # matrix runs: group results per engine in Allure
+    allure.dynamic.parent_suite(spec)
+    return resolve_engine(spec)
+
+
 @pytest.fixture(scope='function')
-def page(request, tmp_path):
-    """Create a Playwright page with per-test video recording.
+def page(request, tmp_path, settings, browser_pool, browser_engine, auth_storage_state, video_pipeline, request_router):
+    """Create a Playwright page in a fresh context with per-test video recording.
+
+    With ``--browsers`` the fixture is parametrized over engines through
+    ``browser_engine``; the pool keeps one warm browser per engine.
 
-    Video files are produced in a temporary directory and moved to
-    `test-results/videos` with a sanitized test name and timestamp.
+    The browser comes from the session ``browser_pool`` unless ``browser_scope``
+    is ``test``, in which case a dedicated browser is launched and closed for
+    this test only.
+
+    ``request_router`` blocks and caches requests on the context when the env
+    configures it.
+
+    When ``auth_storage_state`` provides a cached login, it is injected into the
+    context, so navigating to the inventory page needs no UI login. The page is
+    yielded blank; page objects navigate to where the test starts.
+
+    With ``trace_on`` a Playwright trace is recorded for the context; traces the
+    policy does not keep are dropped without being written, kept ones are
+    attached to Allure (open with ``playwright show-trace``).
+
+    Video files are produced in a temporary directory; retained ones are moved
+    to `test-results/videos` (sanitized test name and timestamp) and attached to
+    Allure by the background ``video_pipeline``.
     """
-    # --- read final (env-aware) config ---
-    config_value = get_config_values(request)
-    browser_name = config_value('browser').lower()
-    channel = config_value('channel').strip()
-    headless = _bool(config_value('headless'))
-    viewport_w, viewport_h = _parse_viewport(config_value('viewport'))
-    record_video = _bool(config_value('record_video'))
-    slowmo = int(config_value('slowmo') or 0)
-    screenshot_policy = config_value('screenshot_on').lower()  # always|teardown|failure
-    base_url = config_value('base_url')
+    # --- final (env-aware) config ---
+    browser_name, channel = browser_engine
+    headless = settings.headless
+    viewport_w, viewport_h = settings.viewport
+    record_video = settings.record_video
+    slowmo = settings.slowmo
+    screenshot_policy = settings.screenshot_on.lower()  # always|teardown|failure
+    browser_scope = settings.browser_scope.lower()  # session|test
+    trace_policy = settings.trace_on.lower()  # off|always|on-failure|retain-on-first-retry
     # --------------------------------
 
     videos_dir = tmp_path / 'videos'
     if record_video:
         videos_dir.mkdir(parents=True, exist_ok=True)
 
-    with sync_playwright() as p:
-        # Select browser
-        if browser_name == 'firefox':
-            browser_type = p.firefox
-        elif browser_name == 'webkit':
-            browser_type = p.webkit
+    node = request.node
+    with timed(node, 'browser_launch'):
+        if browser_scope == 'test':
+            browser = browser_pool.launch(browser_name, channel, headless, slowmo)
         else:
-            browser_name = 'chromium'
-            browser_type = p.chromium
+            browser = browser_pool.acquire(browser_name, channel, headless, slowmo)
 
-        launch_kwargs = {'headless': headless}
-        if browser_name == 'chromium' and channel:
-            launch_kwargs['channel'] = channel
-        if slowmo:
-            launch_kwargs['slow_mo'] = slowmo
-
-        browser = browser_type.launch(**launch_kwargs)
-
-        context_kwargs = {
-            'viewport': {'width': viewport_w, 'height': viewport_h},
-        }
-        if record_video:
-            context_kwargs['record_video_dir'] = str(videos_dir)
+    context_kwargs = {
+        'viewport': {'width': viewport_w, 'height': viewport_h},
+    }
+    if record_video:
+        context_kwargs['record_video_dir'] = str(videos_dir)
+    if auth_storage_state:
+        context_kwargs['storage_state'] = auth_storage_state
 
+    with timed(node, 'context_create'):
         context = browser.new_context(**context_kwargs)
+        request_router.attach(context)
+        tracing = _should_trace(trace_policy, node)
+        if tracing:
+            context.tracing.start(screenshots=True, snapshots=True)
         page = context.new_page()
 
-        # Navigate to base_url early (convenience)
-        try:
-            page.goto(base_url, wait_until='domcontentloaded')
-        except Exception:
-            pass
-
-        yield page
+    # No initial goto: page objects navigate lazily (BasePage.navigate skips reloading the current document)
+    navigation_seconds = navigation_stats['seconds']
+    yield page
+    add_phase_time(node, 'navigation', navigation_stats['seconds'] - navigation_seconds)
 
-        # Teardown screenshot (if policy allows)
-        if screenshot_policy in ('always', 'teardown'):
+    # Teardown screenshot (if policy allows)
+    if screenshot_policy in ('always', 'teardown'):
+        with timed(node, 'screenshot'):
             try:
-                screenshot_path = tmp_path / 'screenshot.png'
-                page.screenshot(path=str(screenshot_path), full_page=True)
-                allure.attach.file(str(screenshot_path), name=f'Screenshot - {request.node.name}', attachment_type=AttachmentType.PNG)
+                capture_screenshot(node, page, f'Screenshot - {node.name}')
             except Exception:
                 pass
 
+    if tracing:
+        with timed(node, 'trace'):
+            _finish_trace(context, trace_policy, node, tmp_path / 'trace.zip')
+
+    video = page.video if record_video else None
+    with timed(node, 'context_close'):
         context.close()
-        browser.close()
+        if browser_scope == 'test':
+            browser.close()
 
-    # Video handling
-    if record_video:
-        files = list(videos_dir.rglob('*.webm'))
-        if files:
-            latest = max(files, key=lambda p: p.stat().st_mtime)
-            dest_dir = Path.cwd() / 'test-results' / 'videos'
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            test_name = _sanitize_filename(request.node.nodeid)
-            timestamp = int(time.time())
-            dest = dest_dir / f'{test_name}_{timestamp}.webm'
+    # Video handling: decide retention now, move and attach the file in the background
+    with timed(node, 'video'):
+        if video:
             try:
-                shutil.move(str(latest), str(dest))
+                src = Path(video.path())
             except Exception:
-                pass
-            if dest.exists():
-                try:
-                    allure.attach.file(str(dest), name=f'Video - {request.node.name}', attachment_type=AttachmentType.WEBM)
-                except Exception:
-                    pass
-
-
-def get_config_values(request):
-    cfg = request.config
-    get = lambda k: _final(cfg, k)
-    return get
+                src = None
+            if src and src.exists():
+                if video_pipeline.keep(src, item_failed(node)):
+                    try:
+                        attachment = reserve_attachment(request.config, f'Video - {node.name}')
+                    except Exception:
+                        attachment = None
+                    video_pipeline.store(src, f'{_sanitize_filename(node.nodeid)}_{int(time.time())}', attachment)
+                else:
+                    video_pipeline.discard(src)
@@ -0,0 +1,49 @@
+from typing import Tuple
+import pytest
+
+from test_client.util.datasets import DatasetError, columns, load_rows, row_tags
+
+
+def dataset_shard(config) -> Tuple[int, int]:
+    """(index, count) of the dataset rows this process collects: (0, 1) unless running under --dist each."""
+    workerinput = getattr(config, 'workerinput', None)
+    if not workerinput or not workerinput.get('ui_dataset_shard'):
+        return 0, 1
+    return int(workerinput['workerid'].lstrip('gw')), int(workerinput['workercount'])
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # under --dist each every worker runs everything it collected, so workers can collect disjoint row shards
+    node.workerinput['ui_dataset_shard'] = node.config.option.dist == 'each'
+
+
+def _register_tags(config, name: str, rows):
+    # tags are only known once a dataset is read (during collection, not in pytest_configure): register them before
+    # pytest.mark.<tag> is looked up, so they neither warn as unknown marks nor fail --strict-markers
+    registered = {line.split(':', 1)[0].split('(', 1)[0].strip() for line in config.getini('markers')}
+    for tag in sorted({tag for row in rows for tag in row_tags(row)} - registered):
+        if not tag.isidentifier():
+            raise DatasetError(f'Dataset {name}: tag {tag!r} is not a valid pytest mark name')
+        config.addinivalue_line('markers', f'{tag}: dataset row tag (from {name})')
+
+
+# trylast: the dataset columns come after pytest-playwright's browser in test ids ([chromium-<row>]), as with parametrize
+@pytest.hookimpl(trylast=True)
+def pytest_generate_tests(metafunc):
+    """Parametrize tests marked ``@pytest.mark.dataset('file.csv', 'arg1, arg2', tags=[...])`` from config/data.
+
+    Rows are read during collection (not at import); a row's ``tags`` column
+    becomes pytest marks on its parameter set, so ``-m`` can select rows.
+    """
+    marker = metafunc.definition.get_closest_marker('dataset')
+    if marker is None:
+        return
+    name = marker.args[0]
+    argnames = marker.args[1] if len(marker.args) > 1 else marker.kwargs['argnames']
+    if isinstance(argnames, str):
+        argnames = [arg.strip() for arg in argnames.split(',') if arg.strip()]
+    rows = load_rows(name, marker.kwargs.get('tags'), dataset_shard(metafunc.config))
+    _register_tags(metafunc.config, name, rows)
+    params = [pytest.param(*values, marks=[getattr(pytest.mark, tag) for tag in row_tags(row)]) for row, values in zip(rows, columns(rows, argnames))]
+    metafunc.parametrize(argnames, params)
@@ -0,0 +1,64 @@
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+class FlakeHistory:
+    """Final outcome and attempt count of every test, one row per run/nodeid, in a local SQLite file.
+
+    Outcomes are 'passed' (first attempt), 'flaky' (passed on a retry) and
+    'failed' (every attempt failed).
+
+    Like TimingHistory, only the controller (or a non-distributed run) writes
+    to it; workers send outcomes along with the teardown report.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY AUTOINCREMENT, started REAL NOT NULL)')
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS outcomes (run_id INTEGER NOT NULL, nodeid TEXT NOT NULL, outcome TEXT NOT NULL, attempts INTEGER NOT NULL)'
+            )
+            db.execute('CREATE INDEX IF NOT EXISTS outcomes_nodeid ON outcomes (nodeid, run_id)')
+
+    @contextmanager
+    def _connect(self):
+        import sqlite3
+
+        with closing(sqlite3.connect(self.path, timeout=30)) as db, db:
+            yield db
+
+    def record_run(self, outcomes: Dict[str, Tuple[str, int]]) -> int:
+        with self._connect() as db:
+            run_id = db.execute('INSERT INTO runs (started) VALUES (?)', (time.time(),)).lastrowid
+            db.executemany(
+                'INSERT INTO outcomes VALUES (?, ?, ?, ?)', [(run_id, nodeid, outcome, attempts) for nodeid, (outcome, attempts) in outcomes.items()]
+            )
+        return run_id
+
+    def flake_rates(self, runs: int, min_runs: int = 3) -> Dict[str, float]:
+        """nodeid -> share of its last `runs` runs that did not pass first time, for tests that passed at least once.
+
+        Tests with fewer than `min_runs` recorded runs are left out, and so are tests whose latest run failed every
+        attempt: a test that broke for good must fail the next run instead of staying quarantined on its flaky past.
+        """
+        with self._connect() as db:
+            rows = db.execute(
+                'SELECT nodeid, outcome FROM ('
+                ' SELECT nodeid, outcome, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY run_id DESC) AS recent FROM outcomes'
+                ') WHERE recent <= ? ORDER BY nodeid, recent',
+                (runs,),
+            ).fetchall()
+        per_test: Dict[str, List[str]] = {}
+        for nodeid, outcome in rows:
+            per_test.setdefault(nodeid, []).append(outcome)
+        rates = {}
+        for nodeid, outcomes in per_test.items():
+            # newest first
+            if len(outcomes) < min_runs or outcomes[0] == 'failed':
+                continue
+            rates[nodeid] = sum(outcome != 'passed' for outcome in outcomes) / len(outcomes)
+        return rates
@@ -1,129 +1,539 @@
-import re
 from pathlib import Path
-import configparser
+from typing import Optional
 import os
 import pytest
 import allure
 from allure_commons.types import AttachmentType
 
+from test_client.pages.base_page import navigation_stats
+from test_client.util import visual
 from test_client.util.logger import get_logger
+from test_client.util.util import validate_locators
+from tests.fixtures.flakiness import FlakeHistory
+from tests.fixtures.screenshots import capture_screenshot
+from tests.fixtures.scheduling import base_nodeid
+from tests.fixtures.settings import Settings, load_settings
+from tests.fixtures.timing import TimingHistory, add_phase_time, format_breakdown, phase_timings_key
 
 log = get_logger(__name__)
 
+# per-item {'setup'|'call'|'teardown': TestReport}, filled by pytest_runtest_makereport
+phase_reports_key = pytest.StashKey[dict]()
+# (run id, regressions) of this session's timing history entry, for the terminal summary
+_timing_run_key = pytest.StashKey[tuple]()
+
+# nodeid -> flake rate from the flaky history, read once on the controller and shipped to workers
+_flake_rates_key = pytest.StashKey[dict]()
+# per-item failures of the attempts that were retried
+_retry_failures_key = pytest.StashKey[list]()
+
+# nodeid -> {phase: seconds} of every finished test (on the controller: reported by all workers)
+_phase_timings = {}
+# nodeid -> [final outcome, attempts] of every finished test, see tests/fixtures/flakiness.py
+_flake_outcomes = {}
+
+_QUARANTINE_REASON = 'quarantined flaky test'
+
 
 def pytest_addoption(parser):
     # New ini options (all overridable via pytest.ini)
     parser.addini('browser', 'Browser engine: chromium|firefox|webkit', default='chromium')
+    parser.addini('browsers', 'Comma-separated engines to run every page test on (e.g. chromium,firefox,webkit); empty = `browser` only', default='')
     parser.addini('channel', 'Chromium channel: chrome|msedge|', default='')
     parser.addini('headless', 'Run headless: true|false', default='true')
     parser.addini('viewport', 'Viewport size WxH', default='1280x720')
     parser.addini('record_video', 'Record video: true|false', default='true')
     parser.addini('slowmo', 'Slow motion (ms)', default='0')
+    parser.addini('async_concurrency', 'Scenarios async_scenarios runs at once in one worker', default='4')
+    parser.addini('video_retention', 'Keep recorded videos: always|on-failure', default='always')
+    parser.addini('video_max_bytes', 'Cap on total bytes of kept videos per worker (0 = unlimited)', default='0')
+    parser.addini('trace_on', 'Playwright tracing: off|always|on-failure|retain-on-first-retry', default='off')
+    parser.addini('browser_scope', 'Browser lifetime: session (pooled, one per worker)|test (launch per test)', default='session')
     parser.addini('screenshot_on', 'Screenshot capture: always|teardown|failure', default='teardown')
+    parser.addini('screenshot_mode', 'Screenshot area: full|viewport|element', default='full')
+    parser.addini('screenshot_selector', 'Selector captured when screenshot_mode = element', default='')
+    parser.addini('screenshot_format', 'Screenshot encoding: png|jpeg', default='png')
+    parser.addini('screenshot_quality', 'JPEG quality 0-100 (screenshot_format = jpeg)', default='80')
+    parser.addini('screenshot_max_pixels', 'Downscale screenshots to at most this many pixels (0 = unlimited)', default='0')
+    parser.addini('auth_cache', 'Reuse a cached logged-in storage state per user: true|false', default='true')
+    parser.addini('auth_cache_ttl', 'Seconds a cached login storage state stays valid', default='300')
+    parser.addini('auth_cache_dir', 'Directory for cached login storage states', default='.pytest_cache/ui-auth')
+    parser.addini('block_resource_types', 'Comma-separated Playwright resource types to abort (e.g. image,font,media)', default='')
+    parser.addini('block_url_patterns', 'Comma-separated URL glob patterns to abort (e.g. *google-analytics.com*)', default='')
+    parser.addini('asset_cache', 'Serve repeated static assets from an on-disk cache shared by tests and workers: true|false', default='false')
+    parser.addini('asset_cache_dir', 'Directory of the shared static asset cache', default='.pytest_cache/ui-asset-cache')
+    parser.addini(
+        'asset_cache_ttl', 'Longest time in seconds a cached asset is served without revalidation, whatever its Cache-Control says', default='3600'
+    )
+    parser.addini('worker_grouping', 'Under xdist, keep tests sharing a user/env/browser on the same worker: true|false', default='true')
+    # outside pytest-playwright's --output dir (test-results), which it empties at the start of every session
+    parser.addini(
+        'timing_history', 'SQLite file keeping per-phase test durations across runs (empty = off)', default='.pytest_cache/ui-timings.sqlite'
+    )
+    parser.addini('timing_report_count', 'Slowest tests/phases listed in the terminal summary', default='5')
+    parser.addini('timing_baseline_runs', 'Previous runs in the rolling baseline a test duration is compared with', default='5')
+    parser.addini('timing_regression_pct', 'Flag tests slower than their baseline by more than this percentage', default='50')
+    parser.addini('retries', 'Rerun a failed test up to this many times in place, on the same worker and warm browser (0 = off)', default='0')
+    parser.addini(
+        'flaky_history',
+        'SQLite file keeping the final outcome and attempts of every test across runs (empty = off)',
+        default='.pytest_cache/ui-flaky.sqlite',
+    )
+    parser.addini('flaky_window', 'Previous runs a test flake rate is computed over', default='10')
+    parser.addini(
+        'flaky_quarantine_pct', 'Quarantine tests whose flake rate reaches this percentage: they run last, in their own group (0 = off)', default='30'
+    )
+    parser.addini('quarantine_nonblocking', 'Report failures of quarantined tests as xfail so they do not fail the run: true|false', default='false')
+    parser.addini(
+        'visual_baseline_dir',
+        'Directory of the expect_matches_baseline screenshots, one subdirectory per browser and viewport',
+        default='config/baselines',
+    )
+    parser.addini('log_dir', 'Directory of the structured JSONL logs, one file per xdist worker (empty = console only)', default='reports/logs')
+    parser.addini('log_rate_limit', 'Console log records per second before INFO/DEBUG output is dropped (0 = unlimited)', default='200')
     parser.addini('allure_dir', 'Allure results directory', default='reports/json')
     parser.addini('base_url', 'Base URL for app under test', default='https://www.saucedemo.com')
+    parser.addini('offline', 'Serve the app from the bundled local stand-in instead of base_url: true|false', default='false')
     parser.addini('app_password_env', 'Environment variable name or placeholder for valid app password', default='APP_PASSWORD')
     parser.addini('standard_app_user_env', 'Environment variable name or placeholder for standard app user', default='STANDARD_APP_USER')
-    parser.addini('app_password_env', 'Environment variable name or placeholder for valid app password', default='APP_PASSWORD')
     parser.addoption(
         '--env', action='store', default=os.environ.get('TEST_ENV', 'local'), help='Environment to use (matches section [env.<name>] in pytest.ini)'
     )
+    parser.addoption(
+        '--browsers',
+        action='store',
+        default=None,
+        help='Run page tests on each engine of this comma-separated list (chromium|firefox|webkit or a chromium channel such as chrome, msedge)',
+    )
+    parser.addoption(
+        '--changed-since',
+        action='store',
+        default=None,
+        metavar='GIT_REF',
+        help='Only run tests whose recorded page objects, locator keys or data files changed since this git ref',
+    )
+    parser.addoption(
+        '--update-baselines',
+        action='store_true',
+        default=False,
+        help='Save the screenshots of expect_matches_baseline as the new baselines instead of comparing',
+    )
+    parser.addoption(
+        '--validate-locators',
+        action='store_true',
+        default=False,
+        help='Check that every locator key constant in test_client/pages/** exists in config/locators.yml, then exit',
+    )
 
 
-def _load_env_overrides(config):
-    """Load overrides from pytest.ini section [env.<name>] if present."""
-    env_name = config.getoption('env')
-    log.info(f'Using test environment: {env_name}')
-    overrides = {}
-    ini_file = config.inifile
-    if ini_file and Path(ini_file).is_file():
-        cp = configparser.ConfigParser()
-        cp.read(ini_file, encoding='utf-8')
-        section = f'env.{env_name}'
-        if cp.has_section(section):
-            for k, v in cp.items(section):
-                overrides[k] = v
-    config._active_env = env_name
-    config._env_overrides = overrides
+# --validate-locators: the session checks the page objects instead of collecting and running tests
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection(session):
+    config = session.config
+    if not config.getoption('validate_locators'):
+        return None
+    problems = validate_locators()
+    tw = config.get_terminal_writer()
+    for problem in problems:
+        tw.line(problem, red=True)
+    if problems:
+        tw.line(f'Locator validation: {len(problems)} problem(s) found', red=True, bold=True)
+    else:
+        tw.line('Locator validation: all keys resolved', green=True)
+    # reported as a failed run (exit code 1)
+    session.testsfailed = len(problems)
+    return True
 
 
-def _final(config, key):
-    return config._env_overrides.get(key, config.getini(key))
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    return True if session.config.getoption('validate_locators') else None
 
 
 # --- Allure results directory bootstrap (now uses allure_dir ini + env overrides) --------
 def pytest_configure(config):
-    _load_env_overrides(config)  # must happen first
-
-    # --- Generic processing of ini keys ending with '_env' that use ${VAR} placeholders ---
-    ini_file = config.inifile
-    placeholder_re = re.compile(r'^\s*\$\{([A-Za-z_][A-Za-z0-9_]*)\}\s*$')
-    try:
-        if ini_file and Path(ini_file).is_file():
-            cp = configparser.ConfigParser()
-            cp.read(ini_file, encoding='utf-8')
-            if cp.has_section('pytest'):
-                for key, _ in cp.items('pytest'):
-                    if not key.endswith('_env'):
-                        continue
-                    val = _final(config, key)
-                    m = placeholder_re.match(str(val or ''))
-                    if not m:
-                        # If not a placeholder like ${VAR}, store raw value as the env-name and leave resolved as None
-                        base = key[:-4]
-                        config.__dict__[f'_{base}_env'] = val
-                        config.__dict__[f'_{base}'] = None
-                        continue
-                    env_var_name = m.group(1)
-                    resolved = os.environ.get(env_var_name)
-                    if resolved is None:
-                        raise pytest.UsageError(f'Environment variable {env_var_name} must be set (referenced by ini key `{key}`)')
-                    base = key[:-4]
-                    # store both the env var name and the resolved value for tests/fixtures
-                    config.__dict__[f'_{base}_env'] = env_var_name
-                    config.__dict__[f'_{base}'] = resolved
-    except Exception:
-        # keep best-effort behavior; let other code handle failures where appropriate
-        raise
+    # resolve settings once: on the controller (or a plain run) from pytest.ini, on xdist workers from workerinput
+    workerinput = getattr(config, 'workerinput', None)
+    if workerinput and 'ui_settings' in workerinput:
+        config._settings = Settings.from_dict(workerinput['ui_settings'])
+    else:
+        config._settings = load_settings(config)
+        log.info(f'Using test environment: {config._settings.env_name}')
+    if workerinput and 'ui_flake_rates' in workerinput:
+        config.stash[_flake_rates_key] = workerinput['ui_flake_rates']
+    else:
+        config.stash[_flake_rates_key] = _load_flake_rates(config._settings)
 
     # --- Allure/results bootstrap (use final values) ---
     allure_dir = getattr(config.option, 'allure_report_dir', None)
     if not allure_dir:
-        allure_dir = _final(config, 'allure_dir')
+        allure_dir = config._settings.allure_dir
         config.option.allure_report_dir = allure_dir
     results_dir = Path(allure_dir)
     results_dir.mkdir(parents=True, exist_ok=True)
 
+    visual.configure(Path(config._settings.visual_baseline_dir).resolve(), update=config.getoption('update_baselines'))
+
     # Dynamic environment.properties (use final values)
+    config._allure_env_extra = {}
+    _write_environment(config)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # ship the resolved settings to each xdist worker instead of re-parsing pytest.ini there
+    node.workerinput['ui_settings'] = node.config._settings.to_dict()
+    node.workerinput['ui_flake_rates'] = node.config.stash[_flake_rates_key]
+
+
+def _load_flake_rates(settings) -> dict:
+    path = Path(settings.flaky_history) if settings.flaky_history else None
+    if path is None or not path.is_file():
+        return {}
+    try:
+        return FlakeHistory(path).flake_rates(settings.flaky_window)
+    except Exception as exc:
+        log.warning('Could not read flaky history %s: %s', path, exc)
+        return {}
+
+
+def is_quarantined(item) -> bool:
+    """True for tests marked ``quarantine``, by hand or because their flake rate reached flaky_quarantine_pct."""
+    return item.get_closest_marker('quarantine') is not None
+
+
+def _failure_tolerated(item) -> bool:
+    return is_quarantined(item) and item.config._settings.quarantine_nonblocking
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # ahead of the xdist state groups (tests/fixtures/scheduling.py): quarantined tests form their own group, scheduled last
+    threshold = config._settings.flaky_quarantine_pct
+    rates = config.stash.get(_flake_rates_key, {})
+    if threshold > 0:
+        for item in items:
+            if rates.get(base_nodeid(item.nodeid), 0.0) * 100 >= threshold and not is_quarantined(item):
+                item.add_marker(pytest.mark.quarantine)
+    quarantined = [item for item in items if is_quarantined(item)]
+    if not quarantined:
+        return
+    if getattr(config.option, 'loadgroup', False):
+        for item in quarantined:
+            if not item.get_closest_marker('xdist_group'):
+                item.add_marker(pytest.mark.xdist_group('quarantine'))
+    items[:] = [item for item in items if not is_quarantined(item)] + quarantined
+
+
+def _format_env_value(value) -> str:
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, tuple) and all(isinstance(v, int) for v in value):
+        return 'x'.join(str(v) for v in value)
+    if isinstance(value, tuple):
+        return ','.join(value)
+    return str(value)
+
+
+def _write_environment(config):
+    settings = config._settings
     try:
-        env_file = results_dir / 'environment.properties'
-        keys = ['base_url', 'browser', 'channel', 'headless', 'viewport', 'record_video', 'slowmo', 'screenshot_on']
+        env_file = Path(config.option.allure_report_dir) / 'environment.properties'
+        keys = [
+            'base_url',
+            'offline',
+            'browser',
+            'browsers',
+            'channel',
+            'headless',
+            'viewport',
+            'record_video',
+            'slowmo',
+            'screenshot_on',
+            'screenshot_mode',
+            'screenshot_format',
+            'browser_scope',
+            'video_retention',
+            'trace_on',
+            'block_resource_types',
+            'block_url_patterns',
+            'asset_cache',
+            'worker_grouping',
+            'retries',
+            'flaky_quarantine_pct',
+            'quarantine_nonblocking',
+        ]
         env_lines = [
-            f'EnvName={config._active_env}',
-            *[f'{k}={_final(config, k)}' for k in keys],
-            f'standard_app_user={getattr(config, "_standard_app_user_env", "")}',
+            f'EnvName={settings.env_name}',
+            *[f'{k}={_format_env_value(getattr(settings, k))}' for k in keys],
+            f'standard_app_user={settings.env_refs.get("standard_app_user", "")}',
             f'Python={os.sys.version.split()[0]}',
             f'OS={os.name}',
+            *[f'{k}={v}' for k, v in config._allure_env_extra.items()],
         ]
         env_file.write_text('\n'.join(env_lines) + '\n', encoding='utf-8')
     except Exception:
         pass
 
 
+def record_environment(config, key, value):
+    """Add a runtime value (timings, counters) to Allure's environment.properties.
+
+    xdist workers hand their values to the controller, which writes them
+    suffixed with the worker id (see pytest_testnodedown).
+    """
+    workeroutput = getattr(config, 'workeroutput', None)
+    if workeroutput is not None:
+        workeroutput.setdefault('allure_env', {})[key] = value
+        return
+    config._allure_env_extra[key] = value
+    _write_environment(config)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    workeroutput = getattr(node, 'workeroutput', {})
+    # the controller runs no tests: its navigation counters are the sum of the workers'
+    navigation_stats.update(workeroutput.get('navigation_stats', {}))
+    worker_env = workeroutput.get('allure_env', {})
+    if not worker_env:
+        return
+    worker_id = node.workerinput.get('workerid', 'worker')
+    for key, value in worker_env.items():
+        node.config._allure_env_extra[f'{key}.{worker_id}'] = value
+    _write_environment(node.config)
+
+
+class _ParentsOf:
+    """`nextitem` stand-in between attempts: teardown finalizes the test's own fixtures and keeps its module/session ones."""
+
+    def __init__(self, item):
+        self._chain = item.listchain()[:-1]
+
+    def listchain(self):
+        return self._chain
+
+
+def _max_attempts(item) -> int:
+    if item.get_closest_marker('no_retry'):
+        return 1
+    return 1 + max(item.config._settings.retries, 0)
+
+
+def _is_last_attempt(item) -> bool:
+    return getattr(item, 'execution_count', 1) >= _max_attempts(item)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Rerun a failed test in place: session fixtures (warm browsers, cached logins) stay up between attempts.
+
+    Reports of a retried attempt are logged with the 'rerun' outcome, so only
+    the last attempt counts towards the run's result.
+    """
+    attempts = _max_attempts(item)
+    if attempts == 1:
+        return None
+    from _pytest.runner import runtestprotocol
+
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    for attempt in range(1, attempts + 1):
+        # pytest-rerunfailures' counter: 1 for the first run, 2 for the first retry (see trace_on = retain-on-first-retry)
+        item.execution_count = attempt
+        last = attempt == attempts
+        reports = runtestprotocol(item, log=False, nextitem=nextitem if last else _ParentsOf(item))
+        retry = not last and any(rep.failed for rep in reports)
+        for rep in reports:
+            if retry and rep.failed:
+                message = rep.longreprtext.strip().splitlines()
+                item.stash.setdefault(_retry_failures_key, []).append(f'attempt {attempt} ({rep.when}): {message[-1] if message else "failed"}')
+                rep.outcome = 'rerun'
+            item.ihook.pytest_runtest_logreport(report=rep)
+        if not retry:
+            break
+        item.stash[phase_reports_key] = {}
+        item.stash[phase_timings_key] = {}
+        add_phase_time(item, 'retry', sum(rep.duration for rep in reports))
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+def pytest_report_teststatus(report, config):
+    if report.outcome == 'rerun':
+        return 'rerun', 'R', ('RERUN', {'yellow': True})
+    return None
+
+
+def pytest_runtest_logreport(report):
+    if report.when == 'teardown':
+        properties = dict(report.user_properties)
+        nodeid = base_nodeid(report.nodeid)
+        if properties.get('phase_timings'):
+            _phase_timings[nodeid] = properties['phase_timings']
+        if properties.get('flake_outcome'):
+            _flake_outcomes[nodeid] = properties['flake_outcome']
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    settings = config._settings
+    if config.getoption('validate_locators'):
+        # nothing was collected, which pytest would report as exit code 5
+        if not session.testsfailed:
+            session.exitstatus = pytest.ExitCode.OK
+        return
+    if hasattr(config, 'workerinput'):
+        config.workeroutput['navigation_stats'] = dict(navigation_stats)
+        return
+    record_environment(config, 'navigations_performed', navigation_stats['performed'])
+    record_environment(config, 'navigations_avoided', navigation_stats['avoided'])
+    if _flake_outcomes:
+        retried = [outcome for outcome, attempts in _flake_outcomes.values() if attempts > 1]
+        record_environment(config, 'retried_tests', len(retried))
+        record_environment(config, 'flaky_tests', retried.count('flaky'))
+        if settings.flaky_history:
+            try:
+                FlakeHistory(Path(settings.flaky_history)).record_run({nodeid: tuple(value) for nodeid, value in _flake_outcomes.items()})
+            except Exception as exc:
+                log.warning('Could not update flaky history %s: %s', settings.flaky_history, exc)
+    if not settings.timing_history or not _phase_timings:
+        return
+    try:
+        history = TimingHistory(Path(settings.timing_history))
+        run_id = history.record_run(_phase_timings)
+        regressions = history.regressions(run_id, _phase_timings, settings.timing_baseline_runs, settings.timing_regression_pct)
+        config.stash[_timing_run_key] = (run_id, regressions)
+    except Exception as exc:
+        log.warning('Could not update timing history %s: %s', settings.timing_history, exc)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if hasattr(config, 'workerinput'):
+        return
+    flaky = sorted(nodeid for nodeid, (outcome, _) in _flake_outcomes.items() if outcome == 'flaky')
+    if flaky:
+        terminalreporter.write_sep('-', f'{len(flaky)} test(s) passed on a retry (flaky)', yellow=True)
+        for nodeid in flaky:
+            terminalreporter.write_line(f'{_flake_outcomes[nodeid][1]} attempts  {nodeid}', yellow=True)
+    if not _phase_timings:
+        return
+    count = config._settings.timing_report_count
+    tr = terminalreporter
+    tr.write_sep('=', f'slowest {count} tests (phase breakdown)')
+    slowest = sorted(_phase_timings.items(), key=lambda kv: -kv[1].get('total', 0.0))[:count]
+    for nodeid, phases in slowest:
+        detail = ', '.join(f'{p} {s:.2f}s' for p, s in sorted(phases.items(), key=lambda kv: -kv[1]) if p not in _REPORT_PHASES)
+        tr.write_line(f'{phases.get("total", 0.0):8.2f}s  {nodeid}  ({detail})')
+    totals = {}
+    for phases in _phase_timings.values():
+        for phase, seconds in phases.items():
+            if phase not in _REPORT_PHASES:
+                totals[phase] = totals.get(phase, 0.0) + seconds
+    tr.write_sep('-', 'time per phase (all tests)')
+    for phase, seconds in sorted(totals.items(), key=lambda kv: -kv[1])[:count]:
+        tr.write_line(f'{seconds:8.2f}s  {phase}')
+    _, regressions = config.stash.get(_timing_run_key, (None, []))
+    if regressions:
+        tr.write_sep('!', f'{len(regressions)} test(s) slower than their baseline', yellow=True)
+        for nodeid, seconds, baseline in regressions:
+            tr.write_line(f'{seconds:8.2f}s  (baseline {baseline:.2f}s)  {nodeid}', yellow=True)
+
+
+# durations pytest measures itself; the rest of a breakdown comes from fixtures (see tests/fixtures/timing.py)
+_REPORT_PHASES = ('setup', 'call', 'teardown', 'total')
+
+
+def _phase_breakdown(item) -> dict:
+    timings = dict(item.stash.get(phase_timings_key, {}))
+    for when, report in item.stash.get(phase_reports_key, {}).items():
+        timings[when] = report.duration
+    timings['total'] = sum(timings.get(when, 0.0) for when in ('setup', 'call', 'teardown'))
+    return {phase: round(seconds, 4) for phase, seconds in timings.items()}
+
+
+def item_failed(item) -> bool:
+    """True when the setup or call phase of `item` failed (usable from fixture teardown); quarantined failures count."""
+    reports = item.stash.get(phase_reports_key, {})
+    return any(rep.failed or getattr(rep, 'wasxfail', None) == _QUARANTINE_REASON for rep in reports.values())
+
+
+def _final_outcome(item) -> Optional[str]:
+    """'passed' | 'flaky' | 'failed' once the last attempt of `item` finished; None for skipped tests."""
+    if item_failed(item):
+        return 'failed'
+    call = item.stash.get(phase_reports_key, {}).get('call')
+    if call is None or call.skipped:
+        return None
+    return 'flaky' if getattr(item, 'execution_count', 1) > 1 else 'passed'
+
+
+def _report_flakiness(item, rep):
+    attempts = getattr(item, 'execution_count', 1)
+    outcome = _final_outcome(item)
+    if outcome is not None:
+        rep.user_properties.append(('flake_outcome', [outcome, attempts]))
+    failures = item.stash.get(_retry_failures_key, [])
+    rate = item.config.stash.get(_flake_rates_key, {}).get(base_nodeid(item.nodeid))
+    if not failures and not is_quarantined(item):
+        return
+    lines = [f'attempts: {attempts}', f'outcome: {outcome or "skipped"}', *failures]
+    if rate is not None:
+        lines.append(f'flake rate (last {item.config._settings.flaky_window} runs): {rate:.0%}')
+    if is_quarantined(item):
+        lines.append('quarantined: failures are reported as xfail' if _failure_tolerated(item) else 'quarantined: runs after the other tests')
+    try:
+        if outcome == 'flaky':
+            allure.dynamic.tag('flaky')
+        if is_quarantined(item):
+            allure.dynamic.tag('quarantined')
+        allure.attach('\n'.join(lines), name='Retries', attachment_type=AttachmentType.TEXT)
+    except Exception:
+        pass
+
+
+def _attach_visual_mismatch(mismatch):
+    images = (('expected', mismatch.expected_png), ('actual', mismatch.actual_png), ('diff', mismatch.diff_png))
+    for label, png in images:
+        if png:
+            try:
+                allure.attach(png, name=f'{mismatch.name} ({label})', attachment_type=AttachmentType.PNG)
+            except Exception:
+                pass
+
+
 # Add failure-time screenshot (covers early failures before fixture teardown)
-@pytest.hookimpl(hookwrapper=True)
+# trylast: innermost wrapper, so Allure and the terminal see a tolerated quarantined failure as xfail
+@pytest.hookimpl(hookwrapper=True, trylast=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
-    if rep.when != 'call' or rep.passed or rep.skipped:
+    if rep.failed and rep.when != 'teardown' and _failure_tolerated(item) and _is_last_attempt(item):
+        rep.outcome = 'skipped'
+        rep.wasxfail = _QUARANTINE_REASON
+    item.stash.setdefault(phase_reports_key, {})[rep.when] = rep
+    if rep.when == 'teardown':
+        # travels with the report to the xdist controller, which keeps the timing and flaky histories
+        timings = _phase_breakdown(item)
+        rep.user_properties.append(('phase_timings', timings))
+        try:
+            allure.attach(format_breakdown(timings), name='Phase timings', attachment_type=AttachmentType.TEXT)
+        except Exception:
+            pass
+        if _is_last_attempt(item) or not item_failed(item):
+            _report_flakiness(item, rep)
+        return
+    if rep.when != 'call' or not item_failed(item):
         return
-    policy = item.config.getini('screenshot_on').lower()
+    mismatch = call.excinfo.value if call.excinfo else None
+    if isinstance(mismatch, visual.VisualMismatch):
+        _attach_visual_mismatch(mismatch)
+    policy = item.config._settings.screenshot_on.lower()
     if policy not in ('always', 'failure'):
         return
     page = item.funcargs.get('page')
     if not page:
         return
     try:
-        allure.attach(page.screenshot(full_page=True), name=f'Failure Screenshot - {item.name}', attachment_type=AttachmentType.PNG)
+        capture_screenshot(item, page, f'Failure Screenshot - {item.name}')
     except Exception:
         pass
@@ -0,0 +1,194 @@
+import subprocess
+from typing import Dict, List, Optional, Set
+import pytest
+
+from test_client.util import impact
+from test_client.util.datasets import dataset_path
+from test_client.util.logger import get_logger
+from test_client.util.util import compile_locators
+from tests.fixtures.scheduling import base_nodeid
+
+log = get_logger(__name__)
+
+# pytest cache entry: nodeid -> sorted dependencies recorded the last time the test ran (see test_client/util/impact.py)
+_IMPACT_CACHE_KEY = 'ui/impact'
+# pytest cache entry: fixture name -> everything its setup was ever seen touching; tests list their fixtures as
+# 'fixture:<name>', so work a shared or cached fixture only does for some tests (a stale login) counts for all of them
+_FIXTURE_CACHE_KEY = 'ui/impact-fixtures'
+_FIXTURE_PREFIX = 'fixture:'
+_LOCATORS_FILE = 'config/locators.yml'
+# changes to these are attributed to the tests that recorded them
+_RECORDED_PREFIXES = ('test_client/pages/', 'config/data/', 'config/baselines/', 'tests/test_')
+# any other change under these may affect every test (fixtures, utilities, settings): nothing is deselected
+_GLOBAL_PREFIXES = ('tests/', 'test_client/', 'config/', 'pytest.ini', 'pyproject.toml', 'uv.lock')
+# a changed page module that no recorded test depends on is treated as global too
+_PAGES_PREFIX = 'test_client/pages/'
+
+# {'files': [...], 'locators': [...], 'everything': bool} for --changed-since, decided on the controller
+_changes_key = pytest.StashKey[Optional[dict]]()
+
+# nodeid -> dependencies of the tests that ran in this session (on the controller: reported by all workers)
+_run_deps: Dict[str, Set[str]] = {}
+# fixture name -> dependencies of its setups in this session (on the controller: reported by all workers)
+_run_fixture_deps: Dict[str, Set[str]] = {}
+# fixture name -> dependencies of setups since the last teardown report of this process
+_pending_fixture_deps: Dict[str, Set[str]] = {}
+
+
+def _git(*args: str) -> str:
+    result = subprocess.run(['git', *args], cwd=impact.PROJECT_ROOT, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise pytest.UsageError(f'--changed-since: git {" ".join(args)} failed: {result.stderr.strip()}')
+    return result.stdout
+
+
+def _changed_locators(ref: str) -> Set[str]:
+    import yaml
+
+    try:
+        old = compile_locators(yaml.safe_load(_git('show', f'{ref}:{_LOCATORS_FILE}')) or {})
+    except pytest.UsageError:
+        old = {}
+    new = compile_locators(yaml.safe_load((impact.PROJECT_ROOT / _LOCATORS_FILE).read_text(encoding='utf-8')) or {})
+    return {impact.locator_dep(*key) for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+def changes_since(ref: str, recorded: Set[str]) -> dict:
+    """Files (committed, staged, unstaged or untracked) and locator keys that differ from `ref`.
+
+    `recorded` holds every dependency in the impact cache: a changed page module no test ever recorded (say, a helper
+    only imported lazily) cannot be attributed, so it counts as a global change.
+    """
+    files = set(_git('diff', '--name-only', ref, '--').split()) | set(_git('ls-files', '--others', '--exclude-standard').split())
+    locators = _changed_locators(ref) if _LOCATORS_FILE in files else set()
+    unattributed = sorted(
+        f
+        for f in files - {_LOCATORS_FILE}
+        if (f.startswith(_GLOBAL_PREFIXES) and not f.startswith(_RECORDED_PREFIXES)) or (f.startswith(_PAGES_PREFIX) and f not in recorded)
+    )
+    if unattributed:
+        log.info('--changed-since %s: %s may affect every test, running all', ref, ', '.join(unattributed))
+    return {'files': sorted(files - {_LOCATORS_FILE}), 'locators': sorted(locators), 'everything': bool(unattributed)}
+
+
+def _expand_fixtures(deps, fixture_deps: Dict[str, List[str]]) -> Set[str]:
+    expanded = set()
+    for dep in deps:
+        if dep.startswith(_FIXTURE_PREFIX):
+            expanded.update(fixture_deps.get(dep[len(_FIXTURE_PREFIX) :], ()))
+        else:
+            expanded.add(dep)
+    return expanded
+
+
+def _recorded_deps(cache) -> Set[str]:
+    if cache is None:
+        return set()
+    maps = (cache.get(_IMPACT_CACHE_KEY, {}), cache.get(_FIXTURE_CACHE_KEY, {}))
+    return {dep for deps_by_name in maps for deps in deps_by_name.values() for dep in deps}
+
+
+def _static_deps(item) -> Set[str]:
+    deps = {impact.file_dep(item.path)}
+    marker = item.get_closest_marker('dataset')
+    if marker is not None:
+        deps.add(impact.file_dep(dataset_path(marker.args[0])))
+    return {dep for dep in deps if dep}
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    workerinput = getattr(config, 'workerinput', None)
+    if workerinput is not None:
+        config.stash[_changes_key] = workerinput.get('ui_impact_changes')
+        return
+    ref = config.getoption('changed_since')
+    config.stash[_changes_key] = changes_since(ref, _recorded_deps(getattr(config, 'cache', None))) if ref else None
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput['ui_impact_changes'] = node.config.stash[_changes_key]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    changes = config.stash.get(_changes_key, None)
+    if not changes or changes['everything']:
+        return
+    changed = set(changes['files']) | set(changes['locators'])
+    cache = getattr(config, 'cache', None)
+    recorded = cache.get(_IMPACT_CACHE_KEY, {}) if cache is not None else {}
+    fixture_deps = cache.get(_FIXTURE_CACHE_KEY, {}) if cache is not None else {}
+    selected, deselected = [], []
+    for item in items:
+        deps = recorded.get(base_nodeid(item.nodeid))
+        # tests without a recorded run cannot be ruled out
+        if deps is None or changed.intersection(_expand_fixtures(deps, fixture_deps)) or changed.intersection(_static_deps(item)):
+            selected.append(item)
+        else:
+            deselected.append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+    if not hasattr(config, 'workerinput'):
+        log.info(
+            '--changed-since: %d changed file(s), %d changed locator(s); %d of %d tests affected',
+            len(changes['files']),
+            len(changes['locators']),
+            len(selected),
+            len(selected) + len(deselected),
+        )
+
+
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_setup(item):
+    impact.start_recording()
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    with impact.recording_scope() as deps:
+        yield
+    if deps:
+        _pending_fixture_deps.setdefault(fixturedef.argname, set()).update(deps)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    rep = outcome.get_result()
+    if rep.when == 'teardown':
+        # travels with the report to the xdist controller, which keeps the dependency maps
+        fixtures = {f'{_FIXTURE_PREFIX}{name}' for name in item.fixturenames}
+        rep.user_properties.append(('impact_deps', sorted(impact.stop_recording() | _static_deps(item) | fixtures)))
+        if _pending_fixture_deps:
+            rep.user_properties.append(('impact_fixture_deps', {name: sorted(deps) for name, deps in _pending_fixture_deps.items()}))
+            _pending_fixture_deps.clear()
+
+
+def pytest_runtest_logreport(report):
+    if report.when == 'teardown':
+        properties = dict(report.user_properties)
+        deps = properties.get('impact_deps')
+        if deps:
+            _run_deps.setdefault(base_nodeid(report.nodeid), set()).update(deps)
+        for name, fixture_deps in (properties.get('impact_fixture_deps') or {}).items():
+            _run_fixture_deps.setdefault(name, set()).update(fixture_deps)
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    cache = getattr(config, 'cache', None)
+    if hasattr(config, 'workerinput') or cache is None or not _run_deps:
+        return
+    recorded: Dict[str, List[str]] = cache.get(_IMPACT_CACHE_KEY, {})
+    recorded.update({nodeid: sorted(deps) for nodeid, deps in _run_deps.items()})
+    cache.set(_IMPACT_CACHE_KEY, recorded)
+    if _run_fixture_deps:
+        # merged, never replaced: a fixture skips its work (e.g. the login behind a fresh cached state) in most runs
+        fixture_deps: Dict[str, List[str]] = cache.get(_FIXTURE_CACHE_KEY, {})
+        for name, deps in _run_fixture_deps.items():
+            fixture_deps[name] = sorted(deps.union(fixture_deps.get(name, ())))
+        cache.set(_FIXTURE_CACHE_KEY, fixture_deps)
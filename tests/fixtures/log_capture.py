@@ -0,0 +1,62 @@
+from pathlib import Path
+import pytest
+import allure
+from allure_commons.types import AttachmentType
+
+from test_client.util.logger import configure_logging, format_records, log_context, shutdown_logging
+from tests.fixtures.hooks import item_failed
+from tests.fixtures.scheduling import get_worker_id
+
+# records logged while the item ran (all phases), attached to Allure when it fails
+_test_records_key = pytest.StashKey[list]()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    settings = config._settings
+    worker = get_worker_id(config)
+    jsonl_path = Path(settings.log_dir) / f'{worker}.jsonl' if settings.log_dir else None
+    configure_logging(jsonl_path, worker=worker, rate_limit=settings.log_rate_limit)
+
+
+def pytest_unconfigure(config):
+    shutdown_logging()
+
+
+def _in_phase(item, phase):
+    records = item.stash.setdefault(_test_records_key, [])
+    return log_context(item.nodeid, phase, records)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    with _in_phase(item, 'setup'):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    with _in_phase(item, 'call'):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    with _in_phase(item, 'teardown'):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    rep = outcome.get_result()
+    if rep.when != 'teardown':
+        return
+    records = item.stash.get(_test_records_key, None)
+    item.stash[_test_records_key] = []
+    if not records or not (rep.failed or item_failed(item)):
+        return
+    try:
+        allure.attach(format_records(records), name='Test log', attachment_type=AttachmentType.TEXT, extension='jsonl')
+    except Exception:
+        pass
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Optional, Sequence
+import pytest
+
+from test_client.util.logger import get_logger
+from tests.fixtures.hooks import record_environment
+
+log = get_logger(__name__)
+
+# Resource types served from the on-disk asset cache
+_CACHEABLE_TYPES = ('script', 'stylesheet', 'image', 'font')
+# Headers that no longer describe the body once Playwright has decoded it
+_DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+# The browser's own validators: only sent when the cache has an entry to revalidate
+_CONDITIONAL_HEADERS = ('if-none-match', 'if-modified-since')
+_MAX_AGE = re.compile(r'(?:^|,)\s*max-age\s*=\s*"?(\d+)', re.IGNORECASE)
+
+
+def _header(headers: dict, name: str) -> Optional[str]:
+    return next((v for k, v in headers.items() if k.lower() == name), None)
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: dict, max_ttl: int) -> float:
+    """Seconds a response may be reused without revalidation (RFC 9111): Cache-Control max-age, else Expires - Date,
+    else 10% of its age since Last-Modified; never more than `max_ttl`."""
+    cache_control = (_header(headers, 'cache-control') or '').lower()
+    if 'no-cache' in cache_control:
+        return 0
+    max_age = _MAX_AGE.search(cache_control)
+    date = _http_date(_header(headers, 'date'))
+    expires = _http_date(_header(headers, 'expires'))
+    last_modified = _http_date(_header(headers, 'last-modified'))
+    if max_age:
+        lifetime = int(max_age.group(1))
+    elif expires is not None and date is not None:
+        lifetime = expires - date
+    elif last_modified is not None and date is not None:
+        lifetime = (date - last_modified) / 10
+    else:
+        lifetime = 0
+    return max(0, min(lifetime, max_ttl))
+
+
+@dataclass
+class NetworkStats:
+    requests_blocked: int = 0
+    cache_hits: int = 0
+    cache_bytes_saved: int = 0
+
+
+class RequestRouter:
+    """Context-level routing: abort blocked requests and serve static assets from an on-disk cache.
+
+    Cache entries are keyed by URL and written atomically, so every test and
+    xdist worker pointing at the same `cache_dir` shares them. An entry is
+    served while fresh per its caching headers (at most `cache_ttl` seconds),
+    then revalidated with its ETag / Last-Modified.
+    """
+
+    def __init__(
+        self,
+        stats: NetworkStats,
+        block_types: Sequence[str] = (),
+        block_patterns: Sequence[str] = (),
+        cache_dir: Optional[Path] = None,
+        cache_ttl: int = 3600,
+    ):
+        self.stats = stats
+        self.block_types = set(block_types)
+        self.block_patterns = tuple(block_patterns)
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.block_types or self.block_patterns or self.cache_dir)
+
+    def attach(self, context):
+        if self.enabled:
+            context.route('**/*', self._handle)
+
+    def _handle(self, route):
+        request = route.request
+        if request.resource_type in self.block_types or any(fnmatch(request.url, p) for p in self.block_patterns):
+            self.stats.requests_blocked += 1
+            route.abort('blockedbyclient')
+            return
+        if self.cache_dir and request.method == 'GET' and request.resource_type in _CACHEABLE_TYPES:
+            self._serve_cached(route, request)
+            return
+        route.continue_()
+
+    def _serve_cached(self, route, request):
+        url = request.url
+        entry = self.cache_dir / hashlib.sha256(url.encode('utf-8')).hexdigest()
+        meta_path = entry.with_suffix('.json')
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            body = entry.read_bytes()
+        except (OSError, ValueError):
+            meta = None
+        if meta is not None and time.time() - meta.get('stored', 0) < freshness_lifetime(meta['headers'], self.cache_ttl):
+            self._hit(route, meta, body)
+            return
+        validators = {}
+        if meta is not None:
+            etag, last_modified = _header(meta['headers'], 'etag'), _header(meta['headers'], 'last-modified')
+            if etag:
+                validators['if-none-match'] = etag
+            if last_modified:
+                validators['if-modified-since'] = last_modified
+        # without an entry a 304 leaves no body to serve, so a miss always asks for the full response
+        request_headers = {k: v for k, v in request.headers.items() if k.lower() not in _CONDITIONAL_HEADERS}
+        response = route.fetch(headers={**request_headers, **validators})
+        if response.status == 304 and meta is not None:
+            # still current: refresh the entry's freshness (and any updated headers) and serve the stored body
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+            meta = {**meta, 'headers': {**meta['headers'], **headers}, 'stored': time.time()}
+            self._store(entry, meta_path, body, meta)
+            self._hit(route, meta, body)
+            return
+        body = response.body()
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        if response.status == 200 and 'no-store' not in (_header(headers, 'cache-control') or '').lower():
+            self._store(entry, meta_path, body, {'url': url, 'status': response.status, 'headers': headers, 'stored': time.time()})
+        route.fulfill(status=response.status, headers=headers, body=body)
+
+    def _hit(self, route, meta: dict, body: bytes):
+        self.stats.cache_hits += 1
+        self.stats.cache_bytes_saved += len(body)
+        route.fulfill(status=meta['status'], headers=meta['headers'], body=body)
+
+    def _store(self, entry: Path, meta_path: Path, body: bytes, meta: dict):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_name(f'{entry.name}.{os.getpid()}.tmp')
+            tmp.write_bytes(body)
+            os.replace(tmp, entry)
+            tmp_meta = meta_path.with_name(f'{meta_path.name}.{os.getpid()}.tmp')
+            tmp_meta.write_text(json.dumps(meta), encoding='utf-8')
+            os.replace(tmp_meta, meta_path)
+        except OSError as e:
+            log.warning('Could not cache %s: %s', meta['url'], e)
+
+
+@pytest.fixture(scope='session')
+def network_stats(request):
+    stats = NetworkStats()
+    yield stats
+    record_environment(request.config, 'network_requests_blocked', stats.requests_blocked)
+    record_environment(request.config, 'network_cache_hits', stats.cache_hits)
+    record_environment(request.config, 'network_cache_bytes_saved', stats.cache_bytes_saved)
+
+
+@pytest.fixture
+def request_router(settings, network_stats):
+    """Router for the test's context per block_resource_types / block_url_patterns / asset_cache."""
+    cache_dir = Path.cwd() / settings.asset_cache_dir if settings.asset_cache else None
+    return RequestRouter(network_stats, settings.block_resource_types, settings.block_url_patterns, cache_dir, settings.asset_cache_ttl)
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture(scope='session')
+def offline_server():
+    """Local Sauce Demo stand-in on an ephemeral port (one per xdist worker)."""
+    from test_client.offline.server import OfflineServer
+
+    server = OfflineServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope='session')
+def app_base_url(request, settings):
+    """Base URL of the app under test: the offline server when `offline = true`, else the `base_url` setting."""
+    if settings.offline:
+        return request.getfixturevalue('offline_server').url
+    return settings.base_url.rstrip('/')
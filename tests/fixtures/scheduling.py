@@ -0,0 +1,134 @@
+import math
+from pathlib import Path
+from typing import Dict, List, Optional
+import pytest
+
+from test_client.util.logger import get_logger
+from tests.fixtures.timing import TimingHistory
+
+log = get_logger(__name__)
+
+_DEFAULT_DURATION = 1.0
+# fixtures that give a test a browser page (and so a login state worth sharing)
+_PAGE_FIXTURES = frozenset({'page', 'async_page', 'async_scenarios'})
+
+# nodeid -> typical seconds per test from the timing history, read on the controller and shipped to workers
+_durations_key = pytest.StashKey[Dict[str, float]]()
+
+
+def get_worker_id(config) -> str:
+    """xdist worker id ('gw0', 'gw1', ...) or 'main' when tests are not distributed."""
+    workerinput = getattr(config, 'workerinput', None)
+    return workerinput['workerid'] if workerinput else 'main'
+
+
+def base_nodeid(nodeid: str) -> str:
+    """Strip the '@group' suffix xdist appends under --dist loadgroup."""
+    if nodeid.rfind('@') > nodeid.rfind(']'):
+        return nodeid.rsplit('@', 1)[0]
+    return nodeid
+
+
+def _read_timing_history(settings) -> Dict[str, float]:
+    path = Path(settings.timing_history) if settings.timing_history else None
+    if path is None or not path.is_file():
+        return {}
+    try:
+        return TimingHistory(path).recent_durations(settings.timing_baseline_runs)
+    except Exception as exc:
+        log.warning('Could not read timing history %s: %s', path, exc)
+        return {}
+
+
+def load_durations(config) -> Dict[str, float]:
+    return config.stash.get(_durations_key, {})
+
+
+def default_duration(durations: Dict[str, float]) -> float:
+    """Estimate for tests without history: the mean recorded duration. Compute it once per pass over the tests."""
+    return sum(durations.values()) / len(durations) if durations else _DEFAULT_DURATION
+
+
+def estimate(durations: Dict[str, float], nodeid: str, default: float) -> float:
+    return durations.get(base_nodeid(nodeid), default)
+
+
+def state_group(item, settings) -> Optional[str]:
+    """'<user>-<env>-<browser>' for tests that open a page, i.e. the state a worker can reuse between them."""
+    if not _PAGE_FIXTURES.intersection(item.fixturenames):
+        return None
+    if item.get_closest_marker('no_auth_cache'):
+        user = 'logged-out'
+    else:
+        user_marker = item.get_closest_marker('auth_user')
+        # a fixed label for the standard user: its resolved login must not end up in group names, nodeids or reports
+        user = user_marker.args[0] if user_marker else 'standard'
+    callspec = getattr(item, 'callspec', None)
+    # pytest-playwright parametrizes browser_name on every page test; it only names the engine in --browsers runs
+    engine = callspec.params.get('browser_name', settings.browser) if callspec and settings.browsers else settings.browser
+    return f'{user}-{settings.env_name}-{engine.lower()}'.replace('@', '_')
+
+
+def _split_by_duration(items: List, seconds: Dict[str, float], budget: float) -> List[List]:
+    # longest-first into the least loaded chunk; as many chunks as needed to stay around `budget` seconds each
+    total = sum(seconds[item.nodeid] for item in items)
+    chunk_count = min(len(items), max(1, math.ceil(total / budget))) if budget > 0 else 1
+    chunks, loads = [[] for _ in range(chunk_count)], [0.0] * chunk_count
+    for item in sorted(items, key=lambda i: -seconds[i.nodeid]):
+        index = loads.index(min(loads))
+        chunks[index].append(item)
+        loads[index] += seconds[item.nodeid]
+    return chunks
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    workerinput = getattr(config, 'workerinput', None)
+    if workerinput is not None:
+        config.stash[_durations_key] = workerinput.get('ui_durations', {})
+        # workers re-parse the command line, which does not carry the switch made below
+        if workerinput.get('ui_loadgroup'):
+            config.option.loadgroup = True
+        return
+    config.stash[_durations_key] = _read_timing_history(config._settings) if config._settings.worker_grouping else {}
+    # with -n, plain load scheduling becomes loadgroup so the state groups below are honoured
+    if config._settings.worker_grouping and getattr(config.option, 'dist', 'no') == 'load':
+        config.option.dist = 'loadgroup'
+        log.info('worker_grouping: distributing tests with --dist loadgroup')
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput['ui_loadgroup'] = node.config.option.dist == 'loadgroup'
+    node.workerinput['ui_durations'] = load_durations(node.config)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # runs on each xdist worker before xdist turns xdist_group marks into nodeid suffixes
+    settings = config._settings
+    if not settings.worker_grouping or not getattr(config.option, 'loadgroup', False):
+        return
+    groups = {}
+    for item in items:
+        key = state_group(item, settings)
+        if key and not item.get_closest_marker('xdist_group'):
+            groups.setdefault(key, []).append(item)
+    durations = load_durations(config)
+    default = default_duration(durations)
+    seconds = {item.nodeid: estimate(durations, item.nodeid, default) for item in items}
+    workers = int(config.workerinput.get('workercount', 1))
+    budget = sum(seconds.values()) / max(workers, 1)
+    for key, members in groups.items():
+        for index, chunk in enumerate(_split_by_duration(members, seconds, budget)):
+            for item in chunk:
+                item.add_marker(pytest.mark.xdist_group(f'{key}.{index}'))
+
+
+@pytest.hookimpl(optionalhook=True, tryfirst=True)
+def pytest_xdist_make_scheduler(config, log):
+    if not config._settings.worker_grouping or config.option.dist != 'loadgroup':
+        return None
+    from tests.fixtures.xdist_scheduler import DurationGroupScheduling
+
+    return DurationGroupScheduling(config, log, load_durations(config))
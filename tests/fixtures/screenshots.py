@@ -0,0 +1,72 @@
+import hashlib
+import pytest
+import allure
+from allure_commons.types import AttachmentType
+
+from test_client.util.logger import get_logger
+
+log = get_logger(__name__)
+
+# sha1 of every screenshot already attached for an item, so identical captures are stored once
+_attached_key = pytest.StashKey[set]()
+
+
+def _screenshot_kwargs(settings):
+    mode = settings.screenshot_mode.lower()  # full|viewport|element
+    fmt = settings.screenshot_format.lower()  # png|jpeg
+    kwargs = {'type': 'jpeg' if fmt in ('jpeg', 'jpg') else 'png'}
+    if kwargs['type'] == 'jpeg':
+        kwargs['quality'] = settings.screenshot_quality
+    if mode == 'full':
+        kwargs['full_page'] = True
+    if settings.screenshot_max_pixels:
+        # one image pixel per CSS pixel on high-DPI screens: less to capture before downscaling
+        kwargs['scale'] = 'css'
+    return mode, kwargs
+
+
+def _downscale(body: bytes, max_pixels: int, kwargs: dict) -> bytes:
+    """Resize an image larger than `max_pixels` to fit, keeping its aspect ratio and format."""
+    import io
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(body))
+    width, height = image.size
+    if width * height <= max_pixels:
+        return body
+    factor = (max_pixels / (width * height)) ** 0.5
+    image = image.resize((max(1, int(width * factor)), max(1, int(height * factor))), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    buffer = io.BytesIO()
+    if kwargs['type'] == 'jpeg':
+        image.convert('RGB').save(buffer, format='JPEG', quality=kwargs.get('quality') or 80)
+    else:
+        image.save(buffer, format='PNG', compress_level=1)
+    return buffer.getvalue()
+
+
+def capture_screenshot(item, page, name: str) -> bool:
+    """Take a screenshot per the screenshot_* ini keys and attach the bytes to Allure in memory.
+
+    Element mode captures `screenshot_selector` (falling back to the viewport
+    when it is not on the page). Captures larger than `screenshot_max_pixels`
+    are downscaled to fit. A capture identical to one already attached
+    for this test is skipped. Returns True when something was attached.
+    """
+    settings = item.config._settings
+    mode, kwargs = _screenshot_kwargs(settings)
+    selector = settings.screenshot_selector
+    if mode == 'element' and selector and page.locator(selector).count():
+        body = page.locator(selector).first.screenshot(**kwargs)
+    else:
+        body = page.screenshot(**kwargs)
+    if settings.screenshot_max_pixels:
+        body = _downscale(body, settings.screenshot_max_pixels, kwargs)
+    digest = hashlib.sha1(body).hexdigest()
+    attached = item.stash.setdefault(_attached_key, set())
+    if digest in attached:
+        log.debug('Skipping duplicate screenshot %s', name)
+        return False
+    attached.add(digest)
+    attachment_type = AttachmentType.JPG if kwargs['type'] == 'jpeg' else AttachmentType.PNG
+    allure.attach(body, name=name, attachment_type=attachment_type)
+    return True
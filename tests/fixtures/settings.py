@@ -0,0 +1,150 @@
+import configparser
+import dataclasses
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import pytest
+
+_PLACEHOLDER_RE = re.compile(r'^\s*\$\{([A-Za-z_][A-Za-z0-9_]*)\}\s*$')
+
+
+def _bool(v) -> bool:
+    return str(v).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _split_list(v) -> Tuple[str, ...]:
+    return tuple(part.strip() for part in str(v).split(',') if part.strip())
+
+
+def _parse_viewport(v) -> Tuple[int, int]:
+    try:
+        w, h = str(v).lower().split('x')
+        return int(w), int(h)
+    except Exception:
+        return 1280, 720
+
+
+_CONVERTERS = {
+    bool: _bool,
+    int: lambda v: int(str(v).strip() or 0),
+    str: lambda v: str(v).strip(),
+    Tuple[int, int]: _parse_viewport,
+    Tuple[str, ...]: _split_list,
+}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Final, typed values of the ini keys for the active env (``[pytest]`` + ``[env.<name>]`` overrides).
+
+    Built once on the controller in ``pytest_configure`` and shipped to xdist
+    workers through ``workerinput``; read it from fixtures via ``settings`` or
+    ``config._settings``.
+    """
+
+    env_name: str
+    base_url: str
+    offline: bool
+    browser: str
+    channel: str
+    # --browsers / `browsers` matrix; empty = single-engine run on `browser`
+    browsers: Tuple[str, ...]
+    headless: bool
+    viewport: Tuple[int, int]
+    record_video: bool
+    slowmo: int
+    browser_scope: str
+    async_concurrency: int
+    video_retention: str
+    video_max_bytes: int
+    trace_on: str
+    screenshot_on: str
+    screenshot_mode: str
+    screenshot_selector: str
+    screenshot_format: str
+    screenshot_quality: int
+    screenshot_max_pixels: int
+    auth_cache: bool
+    auth_cache_ttl: int
+    auth_cache_dir: str
+    block_resource_types: Tuple[str, ...]
+    block_url_patterns: Tuple[str, ...]
+    asset_cache: bool
+    asset_cache_dir: str
+    asset_cache_ttl: int
+    worker_grouping: bool
+    timing_history: str
+    timing_report_count: int
+    timing_baseline_runs: int
+    timing_regression_pct: int
+    retries: int
+    flaky_history: str
+    flaky_window: int
+    flaky_quarantine_pct: int
+    quarantine_nonblocking: bool
+    visual_baseline_dir: str
+    log_dir: str
+    log_rate_limit: int
+    allure_dir: str
+    # `<name>_env` ini keys: <name> -> env var name (or raw value when not a ${VAR} placeholder)
+    env_refs: Dict[str, str] = field(default_factory=dict)
+    # `<name>_env` ini keys: <name> -> resolved env var value (None when not a placeholder)
+    env_values: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    def engines(self) -> Tuple[str, ...]:
+        """Browser specs this run covers: the `browsers` matrix, else just `browser`."""
+        return self.browsers or (self.browser.lower(),)
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Settings':
+        # JSON-ish transport (xdist workerinput) turns tuples into lists
+        data = {k: tuple(v) if isinstance(v, list) else v for k, v in data.items()}
+        return cls(**data)
+
+
+def _ini_keys():
+    return [f.name for f in dataclasses.fields(Settings) if f.name not in ('env_name', 'env_refs', 'env_values')]
+
+
+def load_settings(config) -> Settings:
+    """Parse pytest.ini once and resolve env overrides, ${VAR} placeholders and types."""
+    env_name = config.getoption('env')
+    cp = configparser.ConfigParser()
+    ini_file = config.inifile
+    if ini_file and Path(ini_file).is_file():
+        cp.read(ini_file, encoding='utf-8')
+    section = f'env.{env_name}'
+    overrides = dict(cp.items(section)) if cp.has_section(section) else {}
+
+    def final(key):
+        return overrides.get(key, config.getini(key))
+
+    types = {f.name: f.type for f in dataclasses.fields(Settings)}
+    values = {key: _CONVERTERS[types[key]](final(key)) for key in _ini_keys()}
+    if config.getoption('browsers'):
+        values['browsers'] = _split_list(config.getoption('browsers'))
+    values['browsers'] = tuple(spec.lower() for spec in values['browsers'])
+
+    # --- Generic processing of ini keys ending with '_env' that use ${VAR} placeholders ---
+    env_refs, env_values = {}, {}
+    env_keys = [k for k, _ in cp.items('pytest') if k.endswith('_env')] if cp.has_section('pytest') else []
+    for key in env_keys:
+        base = key[:-4]
+        val = final(key)
+        m = _PLACEHOLDER_RE.match(str(val or ''))
+        if not m:
+            # If not a placeholder like ${VAR}, store raw value as the env-name and leave resolved as None
+            env_refs[base], env_values[base] = val, None
+            continue
+        env_var_name = m.group(1)
+        resolved = os.environ.get(env_var_name)
+        if resolved is None:
+            raise pytest.UsageError(f'Environment variable {env_var_name} must be set (referenced by ini key `{key}`)')
+        env_refs[base], env_values[base] = env_var_name, resolved
+
+    return Settings(env_name=env_name, env_refs=env_refs, env_values=env_values, **values)
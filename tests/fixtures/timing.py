@@ -0,0 +1,108 @@
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import pytest
+
+from test_client.util.logger import get_logger
+
+log = get_logger(__name__)
+
+# per-item {phase: seconds} for the work done by fixtures (browser launch, login, video, ...)
+phase_timings_key = pytest.StashKey[dict]()
+
+
+@contextmanager
+def timed(item, phase: str):
+    """Add the wall time of the block to `phase` in the item's phase breakdown."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase_time(item, phase, time.perf_counter() - started)
+
+
+def add_phase_time(item, phase: str, seconds: float):
+    timings = item.stash.setdefault(phase_timings_key, {})
+    timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+def format_breakdown(timings: Dict[str, float]) -> str:
+    width = max(len(phase) for phase in timings)
+    return '\n'.join(f'{phase:<{width}}  {seconds:8.3f}s' for phase, seconds in sorted(timings.items(), key=lambda kv: -kv[1]))
+
+
+class TimingHistory:
+    """Per-phase durations of every test, one row per run/nodeid/phase, in a local SQLite file.
+
+    Only the controller (or a non-distributed run) writes to it; xdist workers
+    send their timings along with the teardown report.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY AUTOINCREMENT, started REAL NOT NULL)')
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS timings (run_id INTEGER NOT NULL, nodeid TEXT NOT NULL, phase TEXT NOT NULL, seconds REAL NOT NULL)'
+            )
+            db.execute('CREATE INDEX IF NOT EXISTS timings_nodeid ON timings (nodeid, phase, run_id)')
+
+    @contextmanager
+    def _connect(self):
+        import sqlite3
+
+        # the connection's own context manager only commits; closing() releases it
+        with closing(sqlite3.connect(self.path, timeout=30)) as db, db:
+            yield db
+
+    def record_run(self, timings: Dict[str, Dict[str, float]]) -> int:
+        with self._connect() as db:
+            run_id = db.execute('INSERT INTO runs (started) VALUES (?)', (time.time(),)).lastrowid
+            rows = [(run_id, nodeid, phase, seconds) for nodeid, phases in timings.items() for phase, seconds in phases.items()]
+            db.executemany('INSERT INTO timings VALUES (?, ?, ?, ?)', rows)
+        return run_id
+
+    def baseline(self, nodeid: str, before_run: int, runs: int, phase: str = 'total') -> Optional[float]:
+        """Median of the test's last `runs` recorded durations before `before_run` (None without history)."""
+        with self._connect() as db:
+            rows = db.execute(
+                'SELECT seconds FROM timings WHERE nodeid = ? AND phase = ? AND run_id < ? ORDER BY run_id DESC LIMIT ?',
+                (nodeid, phase, before_run, runs),
+            ).fetchall()
+        if not rows:
+            return None
+        import statistics
+
+        return statistics.median(seconds for (seconds,) in rows)
+
+    def recent_durations(self, runs: int, phase: str = 'total') -> Dict[str, float]:
+        """nodeid -> median of its last `runs` recorded durations, for every test with history (feeds xdist scheduling)."""
+        import statistics
+
+        with self._connect() as db:
+            rows = db.execute(
+                'SELECT nodeid, seconds FROM ('
+                ' SELECT nodeid, seconds, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY run_id DESC) AS recent FROM timings WHERE phase = ?'
+                ') WHERE recent <= ?',
+                (phase, runs),
+            ).fetchall()
+        per_test: Dict[str, List[float]] = {}
+        for nodeid, seconds in rows:
+            per_test.setdefault(nodeid, []).append(seconds)
+        return {nodeid: statistics.median(values) for nodeid, values in per_test.items()}
+
+    def regressions(
+        self, run_id: int, timings: Dict[str, Dict[str, float]], runs: int, threshold_pct: int, min_seconds: float = 0.5
+    ) -> List[Tuple[str, float, float]]:
+        """(nodeid, seconds, baseline) for tests whose total is more than `threshold_pct` % above their rolling baseline."""
+        slower = []
+        for nodeid, phases in timings.items():
+            seconds = phases.get('total')
+            baseline = self.baseline(nodeid, run_id, runs) if seconds is not None else None
+            if baseline is None:
+                continue
+            if seconds > baseline * (1 + threshold_pct / 100) and seconds - baseline >= min_seconds:
+                slower.append((nodeid, seconds, baseline))
+        return sorted(slower, key=lambda row: row[2] - row[1])
@@ -0,0 +1,102 @@
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+import pytest
+from allure_commons.model2 import ATTACHMENT_PATTERN, Attachment, ExecutableItem
+from allure_commons.types import AttachmentType
+
+from test_client.util.logger import get_logger
+
+log = get_logger(__name__)
+
+
+class VideoPipeline:
+    """Moves finished test videos into `test-results/videos` on a background thread pool.
+
+    Retention is decided on the test's critical path from cheap facts only
+    (outcome and file size); hardlinking/moving, writing the Allure attachment
+    and deleting the temp files happen in the background so the next test can
+    start immediately.
+    """
+
+    def __init__(self, dest_dir: Path, retention: str = 'always', max_bytes: int = 0, workers: int = 2):
+        self.dest_dir = dest_dir
+        self.retention = retention
+        self.max_bytes = max_bytes
+        self._kept_bytes = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='video')
+
+    def keep(self, src: Path, failed: bool) -> bool:
+        """Decide whether a finished video is retained; reserves its size against the byte cap."""
+        if self.retention == 'on-failure' and not failed:
+            return False
+        size = src.stat().st_size
+        with self._lock:
+            if self.max_bytes and self._kept_bytes + size > self.max_bytes:
+                log.info('Video cap of %s bytes reached, dropping %s', self.max_bytes, src.name)
+                return False
+            self._kept_bytes += size
+        return True
+
+    def store(self, src: Path, name: str, attachment: Optional[Path] = None):
+        """Move `src` to `<dest_dir>/<name>.webm`, then write it to `attachment` (see reserve_attachment)."""
+        self._executor.submit(self._store, src, self.dest_dir / f'{name}.webm', attachment)
+
+    def discard(self, src: Path):
+        self._executor.submit(src.unlink, missing_ok=True)
+
+    def _store(self, src: Path, dest: Path, attachment: Optional[Path]):
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(src, dest)
+                src.unlink()
+            except OSError:
+                shutil.move(str(src), str(dest))
+        except Exception as e:
+            log.warning('Could not store video %s: %s', src, e)
+            return
+        if attachment is None:
+            return
+        try:
+            # a second name for the stored file; copy only across filesystems
+            try:
+                os.link(dest, attachment)
+            except OSError:
+                shutil.copy2(dest, attachment)
+        except Exception as e:
+            log.warning('Could not attach video %s: %s', dest, e)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+def reserve_attachment(config, name: str) -> Optional[Path]:
+    """Add a video attachment to the running Allure test step without writing it; returns the results file to write.
+
+    allure.attach.file copies the file on the spot; the pipeline writes the
+    reserved file instead, before the session ends.
+    """
+    listener = config.pluginmanager.get_plugin('allure_listener')
+    item = listener.allure_logger.get_last_item(ExecutableItem) if listener else None
+    if item is None:
+        return None
+    file_name = ATTACHMENT_PATTERN.format(prefix=uuid.uuid4(), ext=AttachmentType.WEBM.extension)
+    item.attachments.append(Attachment(name=name, source=file_name, type=AttachmentType.WEBM.mime_type))
+    return Path(config.option.allure_report_dir).absolute() / file_name
+
+
+@pytest.fixture(scope='session')
+def video_pipeline(settings):
+    pipeline = VideoPipeline(
+        Path.cwd() / 'test-results' / 'videos',
+        retention=settings.video_retention.lower(),
+        max_bytes=settings.video_max_bytes,
+    )
+    yield pipeline
+    pipeline.close()
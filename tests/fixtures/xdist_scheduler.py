@@ -0,0 +1,32 @@
+from typing import Dict
+
+from xdist.scheduler import LoadGroupScheduling
+
+from tests.fixtures.scheduling import default_duration, estimate
+
+
+class DurationGroupScheduling(LoadGroupScheduling):
+    """``--dist loadgroup`` that hands out the longest work units first.
+
+    Work units (xdist groups, or single tests) are ordered by their summed
+    historical duration, so idle workers pick up the expensive groups early and
+    the cheap ones fill the gaps at the end of the run. Quarantined tests come
+    after all of them.
+    """
+
+    def __init__(self, config, log=None, durations: Dict[str, float] = None):
+        super().__init__(config, log)
+        self.durations = durations or {}
+
+    def schedule(self):
+        if self.collection is None and self.collection_is_completed and self._check_nodes_have_same_collection():
+            units = {}
+            default = default_duration(self.durations)
+            for nodeid in next(iter(self.registered_collections.values())):
+                scope = self._split_scope(nodeid)
+                units[scope] = units.get(scope, 0.0) + estimate(self.durations, nodeid, default)
+            # pre-seed the queue order; LoadScopeScheduling.schedule() fills these keys in place
+            # (the 'quarantine' group of flaky tests goes last, see tests/fixtures/hooks.py)
+            for scope in sorted(units, key=lambda s: (s == 'quarantine', -units[s])):
+                self.workqueue[scope] = {}
+        super().schedule()
@@ -5,23 +5,12 @@ from test_client.pages.sauce_demo.checkout.cart_page import CartPage
 from test_client.pages.sauce_demo.checkout.checkout_info_page import CheckoutInfoPage
 from test_client.pages.sauce_demo.checkout.checkout_overview_page import CheckoutOverviewPage
 from test_client.pages.sauce_demo.checkout.checkout_complete_page import CheckoutCompletePage
+from test_client.pages.sauce_demo.async_pages import AsyncCartPage, AsyncCheckoutInfoPage, AsyncInventoryPage, AsyncLoginPage
+from test_client.util.datasets import load_rows
 from test_client.util.logger import get_logger
-from pathlib import Path
-import csv
 
 log = get_logger(__name__)
 
-_DATA_DIR = Path(__file__).resolve().parent.parent / 'config' / 'data'
-
-
-def _load_csv_dicts(name):
-    path = _DATA_DIR / name
-    with path.open(newline='', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
-
-
-_checkout_missing_rows = _load_csv_dicts('test_checkout_missing_info_validation.csv')
-
 
 @pytest.mark.CHECKOUT
 class TestCheckout:
@@ -29,23 +18,31 @@ class TestCheckout:
     item = 'Sauce Labs Backpack'
 
     @staticmethod
-    def login_and_add_items(page, request, items):
-        log.info('Start helper login_and_add_items items=%s', items)
-        base_url = request.config.getini('base_url')
+    def login_and_add_items(page, request, items, via_ui=False):
+        # via_ui: add items with add-to-cart clicks; otherwise the cart is seeded in localStorage before the first navigation
+        log.info('Start helper login_and_add_items items=%s via_ui=%s', items, via_ui)
+        base_url = request.getfixturevalue('app_base_url')
         login = LoginPage(page, base_url)
-        log.info('Navigating to login page: %s', base_url)
-        login.navigate()
         standard_app_user = request.getfixturevalue('standard_app_user')
-        valid_password = request.getfixturevalue('valid_password')
-        log.info('Logging in user=%s', standard_app_user)
-        login.login(standard_app_user, valid_password)
+        inventory = InventoryPage(page, base_url)
+        if not via_ui:
+            inventory.seed_cart(items)
+        if request.getfixturevalue('auth_storage_state'):
+            log.info('Reusing cached login state user=%s', standard_app_user)
+            inventory.navigate()
+        else:
+            log.info('Navigating to login page: %s', base_url)
+            login.navigate()
+            valid_password = request.getfixturevalue('valid_password')
+            log.info('Logging in user=%s', standard_app_user)
+            login.login(standard_app_user, valid_password)
         assert login.is_logged_in(), f'Login failed for {standard_app_user}'
         log.info('Login successful user=%s', standard_app_user)
 
-        inventory = InventoryPage(page, base_url)
-        for name in items:
-            log.info('Adding item to cart: %s', name)
-            inventory.add_item_by_name(name)
+        if via_ui:
+            for name in items:
+                log.info('Adding item to cart: %s', name)
+                inventory.add_item_by_name(name)
         cart_count = inventory.get_cart_count()
         log.info('Cart count now=%s expected=%s', cart_count, len(items))
         assert cart_count == len(items)
@@ -56,7 +53,7 @@ class TestCheckout:
     @staticmethod
     def proceed_to_overview(page, request, first='John', last='Doe', postal='12345'):
         log.info('Proceed to overview first=%s last=%s postal=%s', first, last, postal)
-        base_url = request.config.getini('base_url')
+        base_url = request.getfixturevalue('app_base_url')
         info = CheckoutInfoPage(page, base_url)
         info.continue_to_overview(first, last, postal)
         log.info('Reached overview page')
@@ -64,7 +61,7 @@ class TestCheckout:
 
     def test_checkout_single_item_success(self, page, request):
         log.info('TEST START: test_checkout_single_item_success')
-        ctx = self.login_and_add_items(page, request, [self.item])
+        ctx = self.login_and_add_items(page, request, [self.item], via_ui=True)
         log.info('Proceed to checkout info from cart')
         ctx['cart'].proceed_to_checkout()
 
@@ -74,7 +71,7 @@ class TestCheckout:
         log.info('Finishing checkout')
         overview.finish_checkout()
 
-        complete = CheckoutCompletePage(page, request.config.getini('base_url'))
+        complete = CheckoutCompletePage(page, request.getfixturevalue('app_base_url'))
         assert complete.is_complete()
         txt = complete.get_complete_text().lower()
         log.info('Completion text lower=%s', txt)
@@ -96,20 +93,17 @@ class TestCheckout:
             log.info('Verified item in overview: %s', i)
         log.info('Finishing checkout for multiple items')
         overview.finish_checkout()
-        complete = CheckoutCompletePage(page, request.config.getini('base_url'))
+        complete = CheckoutCompletePage(page, request.getfixturevalue('app_base_url'))
         assert complete.is_complete()
         log.info('TEST END: test_checkout_multiple_items_success')
 
-    @pytest.mark.parametrize(
-        'missing_field, first, last, postal, expected_error',
-        [(r['missing_field'], r['first'], r['last'], r['postal'], r['expected_error']) for r in _checkout_missing_rows],
-    )
+    @pytest.mark.dataset('test_checkout_missing_info_validation.csv', 'missing_field, first, last, postal, expected_error')
     @pytest.mark.PARAMETERIZED
     def test_checkout_missing_info_validation(self, page, request, missing_field, first, last, postal, expected_error):
         log.info('TEST START: test_checkout_missing_info_validation missing_field=%s', missing_field)
         ctx = self.login_and_add_items(page, request, [self.item])
         ctx['cart'].proceed_to_checkout()
-        base_url = request.config.getini('base_url')
+        base_url = request.getfixturevalue('app_base_url')
         info = CheckoutInfoPage(page, base_url)
         log.info('Submitting checkout info with potential missing field=%s', missing_field)
         info.continue_to_overview(first, last, postal)
@@ -119,6 +113,30 @@ class TestCheckout:
         log.info('Validation matched expected=%s', expected_error)
         log.info('TEST END: test_checkout_missing_info_validation')
 
+    def test_checkout_missing_info_validation_concurrent(self, async_scenarios, app_base_url, standard_app_user, valid_password):
+        # same rows as test_checkout_missing_info_validation, each in its own context, run concurrently in this worker
+        log.info('TEST START: test_checkout_missing_info_validation_concurrent')
+        rows = load_rows('test_checkout_missing_info_validation.csv')
+
+        async def scenario(page, missing_field, first, last, postal, expected_error):
+            inventory = AsyncInventoryPage(page, app_base_url)
+            await inventory.seed_cart([self.item])
+            if async_scenarios.logged_in:
+                await inventory.navigate()
+            else:
+                login = AsyncLoginPage(page, app_base_url)
+                await login.navigate()
+                await login.login(standard_app_user, valid_password)
+            await inventory.open_cart()
+            await AsyncCartPage(page, app_base_url).proceed_to_checkout()
+            await AsyncCheckoutInfoPage(page, app_base_url).continue_to_overview(first, last, postal)
+            err_text = await page.locator(self.ERROR_SELECTOR).inner_text()
+            log.info('Received error text for missing_field=%s: %s', missing_field, err_text)
+            assert err_text.startswith(expected_error), f'{missing_field}: unexpected error text {err_text!r}'
+
+        async_scenarios.run(scenario, [(r['missing_field'], r['first'], r['last'], r['postal'], r['expected_error']) for r in rows])
+        log.info('TEST END: test_checkout_missing_info_validation_concurrent')
+
     def test_cancel_in_overview_returns_inventory(self, page, request):
         log.info('TEST START: test_cancel_in_overview_returns_inventory')
         items = [self.item]
@@ -127,7 +145,7 @@ class TestCheckout:
         overview = self.proceed_to_overview(page, request)
         log.info('Cancelling from overview')
         overview.cancel()
-        inventory = InventoryPage(page, request.config.getini('base_url'))
+        inventory = InventoryPage(page, request.getfixturevalue('app_base_url'))
         cart_count = inventory.get_cart_count()
         log.info('Back to inventory cart_count=%s expected=%s', cart_count, len(items))
         assert cart_count == len(items)
@@ -142,17 +160,17 @@ class TestCheckout:
         assert self.item in overview.get_item_names()
         overview.finish_checkout()
         log.info('Finished checkout; verifying completion page')
-        complete = CheckoutCompletePage(page, request.config.getini('base_url'))
+        complete = CheckoutCompletePage(page, request.getfixturevalue('app_base_url'))
         assert complete.is_complete()
 
         log.info('Navigating back to products')
         complete.back_to_products()
-        inventory = InventoryPage(page, request.config.getini('base_url'))
+        inventory = InventoryPage(page, request.getfixturevalue('app_base_url'))
         log.info('Inventory cart count=%s (sanity)', inventory.get_cart_count())
 
         log.info('Logging out')
-        login_page = LoginPage(page, request.config.getini('base_url'))
+        login_page = LoginPage(page, request.getfixturevalue('app_base_url'))
         login_page.logout_and_verify()
-        assert not login_page.is_logged_in()
+        assert login_page.wait_for_login_outcome(outcomes=('login', 'inventory')) == 'login'
         log.info('Logout verified')
         log.info('TEST END: test_checkout_then_logout')
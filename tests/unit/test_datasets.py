@@ -0,0 +1,67 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from test_client.util.datasets import DatasetError, columns, load_rows, row_tags
+
+pytest_plugins = ['pytester']
+
+
+def test_formats_load_the_same_rows(tmp_path):
+    (tmp_path / 'users.csv').write_text('username,tags\nalice,smoke\nbob,\n', encoding='utf-8')
+    (tmp_path / 'users.jsonl').write_text('{"username": "alice", "tags": ["smoke"]}\n\n{"username": "bob"}\n', encoding='utf-8')
+    (tmp_path / 'users.yaml').write_text('- username: alice\n  tags: smoke\n---\nusername: bob\n', encoding='utf-8')
+    for name in ('users.csv', 'users.jsonl', 'users.yaml'):
+        rows = load_rows(str(tmp_path / name))
+        assert [row['username'] for row in rows] == ['alice', 'bob']
+        assert [row_tags(row) for row in rows] == [('smoke',), ()]
+
+
+def test_tag_filter_and_shards(tmp_path):
+    path = tmp_path / 'rows.csv'
+    path.write_text('n,tags\n0,a\n1,"a, b"\n2,\n3,b\n', encoding='utf-8')
+    assert [row['n'] for row in load_rows(str(path), tags=['b'])] == ['1', '3']
+    assert [row['n'] for row in load_rows(str(path), shard=(1, 2))] == ['1', '3']
+
+
+def test_rows_are_reparsed_when_the_file_changes(tmp_path):
+    path = tmp_path / 'rows.jsonl'
+    path.write_text('{"n": 1}\n', encoding='utf-8')
+    assert load_rows(str(path)) == [{'n': 1}]
+    path.write_text('{"n": 1}\n{"n": 2}\n', encoding='utf-8')
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    assert load_rows(str(path)) == [{'n': 1}, {'n': 2}]
+
+
+def test_errors(tmp_path):
+    with pytest.raises(DatasetError, match='not found'):
+        load_rows(str(tmp_path / 'missing.csv'))
+    (tmp_path / 'rows.txt').write_text('x', encoding='utf-8')
+    with pytest.raises(DatasetError, match='Unsupported dataset format'):
+        load_rows(str(tmp_path / 'rows.txt'))
+    (tmp_path / 'bad.jsonl').write_text('[1]\n', encoding='utf-8')
+    with pytest.raises(DatasetError, match='bad.jsonl:1: expected an object'):
+        load_rows(str(tmp_path / 'bad.jsonl'))
+    with pytest.raises(DatasetError, match='Row 0 has no column'):
+        columns([{'a': 1}], ['a', 'b'])
+
+
+def test_row_tags_become_marks(pytester, monkeypatch):
+    monkeypatch.setenv('PYTHONPATH', str(Path(__file__).parents[2]))
+    data = pytester.path / 'users.csv'
+    data.write_text('username,tags\nalice,smoke\nbob,"smoke, slow"\ncarol,\n', encoding='utf-8')
+    pytester.makeconftest("pytest_plugins = ['tests.fixtures.datasets']")
+    pytester.makeini('[pytest]\nmarkers =\n    dataset: rows from a file\n')
+    pytester.makepyfile(
+        f"""
+        import pytest
+
+        @pytest.mark.dataset({str(data)!r}, 'username')
+        def test_user(username):
+            pass
+        """
+    )
+    result = pytester.runpytest_subprocess('--strict-markers', '-m', 'smoke and not slow', '-v', '-p', 'no:playwright')
+    result.assert_outcomes(passed=1, deselected=2)
+    result.stdout.fnmatch_lines(['*test_user?alice? PASSED*'])
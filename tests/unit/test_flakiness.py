@@ -0,0 +1,27 @@
+from tests.fixtures.flakiness import FlakeHistory
+
+
+def _record(history, *outcomes):
+    for outcome in outcomes:
+        history.record_run({'t::a': (outcome, 1 if outcome == 'passed' else 2)})
+
+
+def test_flake_rate_over_window(tmp_path):
+    history = FlakeHistory(tmp_path / 'flaky.sqlite')
+    _record(history, 'flaky', 'flaky', 'passed', 'flaky', 'passed')
+    assert history.flake_rates(runs=10) == {'t::a': 0.6}
+    assert history.flake_rates(runs=2) == {}
+    assert history.flake_rates(runs=3) == {'t::a': 1 / 3}
+
+
+def test_needs_min_runs(tmp_path):
+    history = FlakeHistory(tmp_path / 'flaky.sqlite')
+    _record(history, 'flaky', 'flaky')
+    assert history.flake_rates(runs=10) == {}
+    assert history.flake_rates(runs=10, min_runs=2) == {'t::a': 1.0}
+
+
+def test_broken_test_is_not_flaky(tmp_path):
+    history = FlakeHistory(tmp_path / 'flaky.sqlite')
+    _record(history, 'flaky', 'flaky', 'passed', 'failed')
+    assert history.flake_rates(runs=10) == {}
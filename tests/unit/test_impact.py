@@ -0,0 +1,41 @@
+import pytest
+
+from test_client.pages.sauce_demo.async_pages import AsyncCartPage
+from test_client.pages.sauce_demo.checkout.inventory_page import InventoryPage
+from test_client.util.impact import class_files
+from tests.fixtures import impact
+
+CART_STATE = 'test_client/pages/sauce_demo/checkout/cart_state.py'
+
+
+def test_class_files_include_imported_page_helpers():
+    assert CART_STATE in class_files(InventoryPage)
+    assert 'test_client/pages/sauce_demo/checkout/cart_mixin.py' in class_files(InventoryPage)
+    # async_pages imports every sync page for SYNC_PAGE; only the mirrored one counts
+    assert 'test_client/pages/sauce_demo/login_page.py' not in class_files(AsyncCartPage)
+
+
+@pytest.fixture
+def changed(monkeypatch):
+    files = []
+
+    def fake_git(*args):
+        return '\n'.join(files) if args[0] == 'diff' else ''
+
+    monkeypatch.setattr(impact, '_git', fake_git)
+    return files
+
+
+def test_recorded_page_change_is_attributed(changed):
+    changed.append(CART_STATE)
+    assert not impact.changes_since('main', {CART_STATE})['everything']
+
+
+def test_unrecorded_page_change_runs_everything(changed):
+    changed.append(CART_STATE)
+    assert impact.changes_since('main', set())['everything']
+
+
+def test_fixture_change_runs_everything(changed):
+    changed.append('tests/fixtures/auth.py')
+    assert impact.changes_since('main', {CART_STATE})['everything']
@@ -0,0 +1,45 @@
+import pytest
+
+from test_client.util import util
+
+
+def test_page_objects_resolve():
+    assert util.validate_locators() == []
+
+
+def test_missing_mixin_key_is_reported(monkeypatch):
+    index = {key: selector for key, selector in util.locator_index().items() if key != ('cart_page', 'cart_badge')}
+    monkeypatch.setattr(util, 'locator_index', lambda: index)
+    problems = util.validate_locators()
+    assert len(problems) == 2
+    assert all("CART_BADGE -> 'cart_page.cart_badge'" in problem for problem in problems)
+    assert any(problem.startswith('test_client.pages.sauce_demo.checkout.cart_page:CartPage.') for problem in problems)
+
+
+def test_compile_locators_normalizes_ids():
+    index = util.compile_locators({'login_page': {'id': {'username': 'user-name', 'button': '#login'}, 'css': {'error': '.error'}}})
+    assert index == {('login_page', 'username'): '#user-name', ('login_page', 'button'): '#login', ('login_page', 'error'): '.error'}
+
+
+def test_compile_locators_reports_every_problem():
+    data = {'cart_page': {'id': {'checkout': 'checkout'}, 'css': {'checkout': '.checkout', 'badge': None}}, 'broken': ['css']}
+    with pytest.raises(util.LocatorConfigError) as excinfo:
+        util.compile_locators(data)
+    message = str(excinfo.value)
+    assert "Locator key 'checkout' for page 'cart_page' defined twice (id and css)" in message
+    assert "Locator key 'badge' for page 'cart_page' has no selector" in message
+    assert "Page 'broken' must map locator types to keys" in message
+
+
+def test_duplicate_yaml_key_is_rejected():
+    import yaml
+
+    with pytest.raises(util.LocatorConfigError, match="Duplicate key 'username'"):
+        yaml.load('login_page:\n  id:\n    username: a\n    username: b\n', Loader=util._unique_key_loader())
+
+
+def test_unknown_key_fails_binding():
+    with pytest.raises(util.LocatorConfigError, match=r"\['nope'\] not found for page 'login_page'"):
+        util.bind_locators('login_page', ['nope'])
+    with pytest.raises(KeyError, match="Page 'no_such_page' not found"):
+        util.bind_locators('no_such_page', [])
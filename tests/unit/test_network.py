@@ -0,0 +1,66 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from tests.fixtures.network import NetworkStats, RequestRouter, freshness_lifetime
+
+DATE = 'Wed, 21 Oct 2026 07:00:00 GMT'
+
+
+@pytest.mark.parametrize(
+    'headers, expected',
+    [
+        ({'Cache-Control': 'public, max-age=600'}, 600),
+        ({'cache-control': 'max-age="120", must-revalidate'}, 120),
+        ({'Cache-Control': 's-maxage=900'}, 0),
+        ({'Cache-Control': 'no-cache, max-age=600'}, 0),
+        ({'Cache-Control': 'max-age=999999'}, 3600),
+        ({'Date': DATE, 'Expires': 'Wed, 21 Oct 2026 07:05:00 GMT'}, 300),
+        ({'Date': DATE, 'Expires': '0'}, 0),
+        ({'Date': DATE, 'Last-Modified': 'Wed, 21 Oct 2026 06:00:00 GMT'}, 360),
+        ({}, 0),
+    ],
+)
+def test_freshness_lifetime(headers, expected):
+    assert freshness_lifetime(headers, max_ttl=3600) == expected
+
+
+class _Route:
+    def __init__(self, headers, status):
+        self.request = SimpleNamespace(url='https://app.test/app.js', method='GET', resource_type='script', headers=headers)
+        self.status = status
+        self.fetched = []
+        self.fulfilled = None
+
+    def fetch(self, headers=None):
+        self.fetched.append(headers)
+        conditional = any(k.lower() in ('if-none-match', 'if-modified-since') for k in headers or {})
+        status = self.status if conditional else 200
+        return SimpleNamespace(status=status, headers={'etag': '"v2"', 'cache-control': 'max-age=60'}, body=lambda: b'' if status == 304 else b'js')
+
+    def fulfill(self, status, headers, body):
+        self.fulfilled = (status, body)
+
+
+def test_browser_validators_without_entry_fetch_full_response(tmp_path):
+    router = RequestRouter(NetworkStats(), cache_dir=tmp_path)
+    route = _Route({'accept': '*/*', 'If-None-Match': '"v1"'}, status=304)
+    router._handle(route)
+    assert route.fetched == [{'accept': '*/*'}]
+    assert route.fulfilled == (200, b'js')
+    (meta_path,) = tmp_path.glob('*.json')
+    assert json.loads(meta_path.read_text())['headers']['etag'] == '"v2"'
+
+
+def test_stale_entry_revalidates(tmp_path):
+    router = RequestRouter(NetworkStats(), cache_dir=tmp_path)
+    router._handle(_Route({}, status=304))
+    for meta_path in tmp_path.glob('*.json'):
+        meta = json.loads(meta_path.read_text())
+        meta_path.write_text(json.dumps({**meta, 'stored': 0}))
+    route = _Route({}, status=304)
+    router._handle(route)
+    assert route.fetched == [{'if-none-match': '"v2"'}]
+    assert route.fulfilled == (200, b'js')
+    assert router.stats.cache_hits == 1
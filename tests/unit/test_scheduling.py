@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tests.fixtures.scheduling import base_nodeid, state_group
+
+
+def _item(*marks, fixtures=('page',)):
+    markers = {mark.name: mark for mark in marks}
+    return SimpleNamespace(fixturenames=list(fixtures), get_closest_marker=markers.get, callspec=SimpleNamespace(params={'browser_name': 'Firefox'}))
+
+
+_SETTINGS = SimpleNamespace(env_name='qa', browser='chromium', browsers=('firefox',), env_values={'standard_app_user': 'real.login@example.com'})
+
+
+def test_standard_user_group_does_not_carry_the_login():
+    assert state_group(_item(), _SETTINGS) == 'standard-qa-firefox'
+
+
+def test_marked_user_and_logged_out_groups():
+    assert state_group(_item(pytest.mark.auth_user('problem_user').mark), _SETTINGS) == 'problem_user-qa-firefox'
+    assert state_group(_item(pytest.mark.no_auth_cache.mark), _SETTINGS) == 'logged-out-qa-firefox'
+    assert state_group(_item(fixtures=('settings',)), _SETTINGS) is None
+
+
+def test_base_nodeid():
+    assert base_nodeid('tests/test_a.py::test[x@y]@standard-qa-chromium.0') == 'tests/test_a.py::test[x@y]'
+    assert base_nodeid('tests/test_a.py::test[x@y]') == 'tests/test_a.py::test[x@y]'
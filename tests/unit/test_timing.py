@@ -0,0 +1,45 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from tests.fixtures.timing import TimingHistory
+
+pytest_plugins = ['pytester']
+
+
+def test_baseline_is_median_of_previous_runs(tmp_path):
+    history = TimingHistory(tmp_path / 'timings.sqlite')
+    for seconds in (1.0, 3.0, 2.0):
+        history.record_run({'t::a': {'total': seconds}})
+    latest = history.record_run({'t::a': {'total': 9.0}})
+    assert history.baseline('t::a', latest, runs=5) == 2.0
+    assert history.baseline('t::a', latest, runs=1) == 2.0
+    assert history.baseline('t::other', latest, runs=5) is None
+
+
+def test_regressions_need_threshold_and_min_seconds(tmp_path):
+    history = TimingHistory(tmp_path / 'timings.sqlite')
+    history.record_run({'t::slow': {'total': 1.0}, 't::tiny': {'total': 0.1}})
+    timings = {'t::slow': {'total': 2.0}, 't::tiny': {'total': 0.3}, 't::new': {'total': 5.0}}
+    run_id = history.record_run(timings)
+    assert history.regressions(run_id, timings, runs=5, threshold_pct=50) == [('t::slow', 2.0, 1.0)]
+
+
+def test_recent_durations(tmp_path):
+    history = TimingHistory(tmp_path / 'timings.sqlite')
+    for seconds in (10.0, 1.0, 2.0, 3.0):
+        history.record_run({'t::a': {'total': seconds, 'login': 0.5}})
+    assert history.recent_durations(runs=3) == {'t::a': 2.0}
+
+
+def test_history_survives_playwright_output_cleanup(pytester, monkeypatch):
+    # pytest-playwright empties --output (test-results) at the start of every session
+    monkeypatch.setenv('PYTHONPATH', str(Path(__file__).parents[2]))
+    pytester.makeconftest("pytest_plugins = ['tests.fixtures.scheduling', 'tests.fixtures.hooks']")
+    pytester.makepyfile('def test_ok():\n    pass\n')
+    for _ in range(2):
+        pytester.runpytest_subprocess().assert_outcomes(passed=1)
+    path = pytester.path / '.pytest_cache' / 'ui-timings.sqlite'
+    with sqlite3.connect(path) as db:
+        assert db.execute('SELECT COUNT(*) FROM runs').fetchone() == (2,)